@@ -0,0 +1,5 @@
+"""the simulator of an epidemic as a package. importing it (or running a simulation with it) only loads numpy, matplotlib is only
+imported by the modules which draw: view, blitting, render and replay (and the window, corona-Simulator.py).
+python -m corona config.json runs a headless simulation of a config file (see __main__.py)."""
+from .scenarios import default_dict, default_values, scenario, scenario_dict
+from .simulation import Simulation
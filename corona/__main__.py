@@ -0,0 +1,29 @@
+"""runs a headless simulation of a config file, a json object in the format of Simulation (keys of default_dict, "scenario",
+"seed", "output", "record", ...). nothing but numpy is imported unless the recording is rendered afterwards.
+usage: python -m corona config.json --days 200
+       python -m corona config.json --days 50 --checkpoint state.npz --render frames/"""
+import argparse
+import json
+
+from .simulation import Simulation
+
+parser = argparse.ArgumentParser(prog = "python -m corona", description = "runs a headless simulation of a config file")
+parser.add_argument("config", help = "json file with the config of the simulation (see simulation.py)")
+parser.add_argument("--days", type = int, default = 100)
+parser.add_argument("--checkpoint", help = "saves the state at the end into this .npz file (see checkpoint.py)")
+parser.add_argument("--render", help = "draws the recording (the config key \"record\") into this directory, .gif or video (see render.py)")
+args = parser.parse_args()
+with open(args.config) as file:
+    config = json.load(file)
+if args.render and not config.get("record"):
+    parser.error("--render needs a recording, the config has no \"record\"")
+simulation = Simulation(config)
+series = simulation.run(args.days)
+if args.checkpoint:
+    from . import checkpoint
+    checkpoint.save(simulation.scenario, args.checkpoint)
+simulation.close()
+print("day %d:" % args.days, ", ".join("%s %d" % (char, series[char][-1]) for char in series))
+if args.render:
+    from . import render
+    print(render.render(config["record"], args.render), "frames drawn into", args.render)
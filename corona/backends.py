@@ -0,0 +1,144 @@
+"""the backends of the inner kernels: walking (see Population.keep_going), finding the pairs of persons of a room who are in contact
+and deciding who gets infected (see contacts.py). the random numbers are always drawn outside of the kernels, so every backend
+gives exactly the same results for the same seed. the one exception are compact positions (float32): numpy walks them with
+its own vectorized float32 cos and sin, the loop in double precision, so they drift apart by float32 rounding (a few 1e-6 a day),
+and with that sooner or later a contact at the edge of the radius. taking every step in double precision would make the compact
+walk of numpy more than twice as slow.
+"numpy" works on whole arrays and is the default. "numba" compiles the plain loops below (the way they were written before
+everything became arrays) to machine code, "auto" takes numba whenever it is installed."""
+import math
+
+import numpy as np
+
+from . import contacts
+
+
+def walk_loop(x, y, angle, angle_diff, width, height, border, speed):
+    for n in range(len(x)):
+        inside = border[n] < x[n] < width[n] - border[n] and border[n] < y[n] < height[n] - border[n]
+        if not inside:
+            angle_diff[n] = 0.5
+        angle[n] = (angle[n] + angle_diff[n]) % 1
+        x[n] += speed * math.cos(angle[n] * 2 * math.pi)
+        y[n] += speed * math.sin(angle[n] * 2 * math.pi)
+
+
+def contact_pairs_loop(x, y, width, height, radius):
+    """the pairs (p, o) with o < p in contact, in the order of contacts.checked_pairs: every person looks at the raster cells
+    within int(radius) of their own one (the last row and column are never looked at) and at the persons within them.
+    also returns the number of distances computed (just like contacts.contact_pairs)"""
+    number = len(x)
+    rad_int = int(radius)
+    cell_x = np.empty(number, dtype = np.int64)
+    cell_y = np.empty(number, dtype = np.int64)
+    # the persons of every raster cell, in the order of their index
+    starts = np.zeros(width * height + 1, dtype = np.int64)
+    for n in range(number):
+        cell_x[n], cell_y[n] = int(x[n]), int(y[n])
+        if 0 <= cell_x[n] < width and 0 <= cell_y[n] < height:
+            starts[cell_x[n] * height + cell_y[n] + 1] += 1
+    for cell in range(width * height):
+        starts[cell + 1] += starts[cell]
+    filled = starts[:-1].copy()
+    in_cell = np.empty(starts[-1], dtype = np.int64)
+    for n in range(number):
+        if 0 <= cell_x[n] < width and 0 <= cell_y[n] < height:
+            cell = cell_x[n] * height + cell_y[n]
+            in_cell[filled[cell]] = n
+            filled[cell] += 1
+    pairs = np.empty((4 * number + 16, 2), dtype = np.int64)
+    found = 0
+    checks = 0
+    for p in range(number):
+        for i in range(max(cell_x[p] - rad_int, 0), min(cell_x[p] + rad_int + 1, width - 1)):
+            for j in range(max(cell_y[p] - rad_int, 0), min(cell_y[p] + rad_int + 1, height - 1)):
+                cell = i * height + j
+                for k in range(starts[cell], starts[cell + 1]):
+                    o = in_cell[k]
+                    if o >= p:
+                        break
+                    checks += 1
+                    if (x[p] - x[o])**2 + (y[p] - y[o])**2 <= radius**2:
+                        if found == len(pairs):
+                            pairs = np.concatenate((pairs, np.empty_like(pairs)))
+                        pairs[found, 0], pairs[found, 1] = p, o
+                        found += 1
+    return pairs[:found, 0].copy(), pairs[:found, 1].copy(), checks
+
+
+def resolve_infections_loop(infected, p, o, coins):
+    """the persons one after another: an infected p infects o, a vulnerable p gets infected by an o who is infected by now"""
+    number = len(infected)
+    never = number
+    time = np.full(number, never, dtype = np.int64)
+    for n in range(number):
+        if infected[n]:
+            time[n] = -1
+    for k in range(len(p)):
+        if coins[k]:
+            if infected[p[k]]:
+                time[o[k]] = min(time[o[k]], p[k])
+            elif time[o[k]] < p[k]:
+                time[p[k]] = min(time[p[k]], p[k])
+    got_infected = np.zeros(number, dtype = np.bool_)
+    for n in range(number):
+        got_infected[n] = time[n] == n and not infected[n]
+    return time < never, got_infected
+
+
+class NumpyBackend:
+    name = "numpy"
+
+    def walk(self, x, y, angle, angle_diff, width, height, border, speed):
+        """turns (by angle_diff, or around for whoever is outside of the border) and walks one step, changes the arrays"""
+        inside = (border < x) & (x < width - border) & (border < y) & (y < height - border)
+        angle_diff[~inside] = 0.5
+        angle += angle_diff
+        angle %= 1
+        x += speed * np.cos(angle * 2 * np.pi)
+        y += speed * np.sin(angle * 2 * np.pi)
+
+    def contact_pairs(self, x, y, size, radius):
+        return contacts.contact_pairs(x, y, size, radius)
+
+    def resolve_infections(self, infected, p, o, coins):
+        return contacts.resolve_infections(infected, p, o, coins)
+
+
+class NumbaBackend(NumpyBackend):
+    """the loops above compiled with numba (which has to be installed), they are compiled on first use and cached on disk"""
+    name = "numba"
+
+    def __init__(self):
+        try:
+            import numba
+        except ImportError:
+            raise ImportError("the numba backend needs numba (pip install numba), use the numpy backend instead")
+        self.walk_loop = numba.njit(cache = True)(walk_loop)
+        self.contact_pairs_loop = numba.njit(cache = True)(contact_pairs_loop)
+        self.resolve_infections_loop = numba.njit(cache = True)(resolve_infections_loop)
+
+    def walk(self, x, y, angle, angle_diff, width, height, border, speed):
+        self.walk_loop(x, y, angle, angle_diff, width, height, border, float(speed))
+
+    def contact_pairs(self, x, y, size, radius):
+        return self.contact_pairs_loop(x, y, int(size[0]), int(size[1]), float(radius))
+
+    def resolve_infections(self, infected, p, o, coins):
+        return self.resolve_infections_loop(infected, p, o, coins)
+
+
+backends = {"numpy": NumpyBackend, "numba": NumbaBackend}
+created = {}
+
+
+def get_backend(name = "numpy"):
+    """the backend called name (a key of backends, or "auto" for numba if it is installed and numpy otherwise)"""
+    if name == "auto":
+        try:
+            return get_backend("numba")
+        except ImportError:
+            return get_backend("numpy")
+    if name not in created:
+        created[name] = backends[name]()
+    return created[name]
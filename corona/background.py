@@ -0,0 +1,85 @@
+"""the simulation on a thread of its own: the scenario is advanced in the background at its own rate, while the window only
+draws the latest state whenever it is redrawn. speed is the number of frames which are simulated per drawn frame,
+so the window can skip over many days between two pictures instead of showing every frame of every day."""
+import threading
+import time
+
+
+class BackgroundSimulation:
+    """advances scenario on a daemon thread. every time the window has drawn a frame (see drawn), speed more frames may be simulated,
+    at most backlog drawn frames worth of them are kept, so the picture never lags far behind. with speed None it runs as fast as it can.
+    everything that reads or changes the scenario from outside has to hold lock (with background.lock: ...),
+    the thread only holds it while it advances the scenario by one frame"""
+    def __init__(self, scenario, speed = 1, backlog = 2):
+        self.scenario = scenario
+        self.speed = speed
+        self.backlog = backlog
+        self.budget = 0
+        self.frames = 0
+        self.paused = False
+        self.stop_after_day = False
+        self.running = True
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.thread = threading.Thread(target = self.loop, daemon = True)
+        self.thread.start()
+
+    def may_advance(self):
+        return not self.paused and (self.speed is None or self.budget >= 1)
+
+    def loop(self):
+        while True:
+            with self.changed:
+                while self.running and not self.may_advance():
+                    self.changed.wait()
+                if not self.running:
+                    return
+                self.advance()
+            # gives the window a chance to get the lock between two frames
+            time.sleep(0)
+
+    def advance(self):
+        """one frame, at the end of a day the time step comes first (just like in the animation loop of the window)"""
+        scenario = self.scenario
+        if scenario.current_frame >= scenario.frames_per_day:
+            scenario.current_frame = 0
+            scenario.time_step()
+            if self.stop_after_day:
+                self.stop_after_day = False
+                self.paused = True
+                return
+        scenario.current_frame += 1
+        scenario.update_scatters()
+        self.budget -= 1
+        self.frames += 1
+
+    def drawn(self):
+        """has to be called once per drawn frame, allows the thread to simulate the next speed frames"""
+        with self.changed:
+            if self.speed is not None:
+                self.budget = min(self.budget + self.speed, self.backlog * self.speed)
+            self.changed.notify()
+
+    def pause(self):
+        with self.changed:
+            self.paused = True
+
+    def resume(self):
+        with self.changed:
+            self.paused = False
+            self.stop_after_day = False
+            self.changed.notify()
+
+    def step(self):
+        """simulates up to the end of the current day and pauses again"""
+        with self.changed:
+            self.paused = False
+            self.stop_after_day = True
+            self.changed.notify()
+
+    def stop(self):
+        """ends the thread"""
+        with self.changed:
+            self.running = False
+            self.changed.notify()
+        self.thread.join()
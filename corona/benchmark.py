@@ -0,0 +1,133 @@
+"""benchmarks of the hot paths of the simulation: calculate_infected of a room, keep_going of the population, update_scatters,
+time_step, create_rooms and a whole day, for every scenario on a grid of members, number of rooms, radius and shape.
+the timings are written into a json file, and can be compared with the ones of an earlier run (the baseline).
+usage: python -m corona.benchmark --out benchmark.json
+       python -m corona.benchmark --points 2 --scenarios Standard Cluster --baseline benchmark.json --out new.json"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from .scenarios import default_values, scenario_dict
+from .sweep import grid, value_range
+
+matrix_keys = ["members", "number of rooms", "radius", "shape"]
+
+
+def timings(function, repeat):
+    """calls function repeat times and returns the time every call took"""
+    times = []
+    for n in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def new_scenario(name, config, seed, backend = "numpy"):
+    values = dict(default_values(), **config)
+    return scenario_dict[name].from_values(values, seed = seed, backend = backend)
+
+
+def run_config(name, config, repeat = 5, warmup = 12, seed = 0, backend = "numpy"):
+    """times every benchmark for the scenario name with config (keys of default_dict) with the kernels of backend,
+    returns a dict from benchmark to times"""
+    times = {}
+    created = []
+    def create():
+        created.append(new_scenario(name, config, seed, backend))
+        created[-1].create_rooms()
+    times["create_rooms"] = timings(create, repeat)
+    scenario = created[-1]
+    # the persons spread out and a few get infected before anything is measured
+    for frame in range(warmup):
+        scenario.update_scatters()
+    width, height, border = scenario.room_geometry()
+    times["keep_going"] = timings(lambda: scenario.population.keep_going(width, height, border, scenario.speed, scenario.kernels), repeat)
+    times["update_scatters"] = timings(scenario.update_scatters, repeat)
+    room = scenario.rooms[0]
+    times["calculate_infected"] = timings(lambda: room.calculate_infected(scenario.population, [], scenario.radius,
+                                                                          scenario.infectionrate, scenario.rng, scenario.kernels), repeat)
+    times["time_step"] = timings(scenario.time_step, repeat)
+    def day():
+        for frame in range(scenario.frames_per_day):
+            scenario.update_scatters()
+        scenario.time_step()
+    times["day"] = timings(day, repeat)
+    return times
+
+
+def run(scenarios, configs, repeat = 5, seed = 0, progress = None, backend = "numpy"):
+    """runs every benchmark of every configuration, returns the rows of the result file"""
+    rows = []
+    for name in scenarios:
+        for config in configs:
+            for benchmark, times in run_config(name, config, repeat, seed = seed, backend = backend).items():
+                rows.append({"scenario": name, "config": config, "benchmark": benchmark, "backend": backend,
+                             "best": min(times), "median": float(np.median(times))})
+            if progress:
+                progress(name, config)
+    return rows
+
+
+def row_key(row):
+    return row["scenario"], tuple(sorted(row["config"].items())), row["benchmark"]
+
+
+def compare(rows, baseline, threshold = 0.1):
+    """the rows which are also in baseline, each with the ratio of its best time to the one of the baseline.
+    a ratio above 1 + threshold is a regression, one below 1 - threshold a gain"""
+    old = {row_key(row): row for row in baseline}
+    compared = []
+    for row in rows:
+        if row_key(row) in old:
+            ratio = row["best"] / old[row_key(row)]["best"]
+            change = "regression" if ratio > 1 + threshold else "gain" if ratio < 1 - threshold else ""
+            compared.append(dict(row, ratio = ratio, change = change))
+    return compared
+
+
+def write(rows, path, repeat):
+    meta = {"python": sys.version.split()[0], "numpy": np.__version__, "platform": platform.platform(),
+            "machine": platform.machine(), "repeat": repeat, "time": time.strftime("%Y-%m-%d %H:%M:%S")}
+    with open(path, "w") as file:
+        json.dump({"meta": meta, "results": rows}, file, indent = 1)
+
+
+def read(path):
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def describe(row):
+    return "%-12s %-45s %-19s" % (row["scenario"], ", ".join("%s=%s" % item for item in row["config"].items()), row["benchmark"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "times the hot paths of the simulation")
+    parser.add_argument("--scenarios", nargs = "+", default = list(scenario_dict), help = "keys of scenario_dict")
+    parser.add_argument("--keys", nargs = "+", default = matrix_keys, help = "keys of default_dict which make up the grid")
+    parser.add_argument("--points", type = int, default = 3, help = "number of values per key, from min to max of default_dict")
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--backend", default = "numpy", help = "numpy, numba or auto (see backends.py)")
+    parser.add_argument("--out", default = "benchmark.json")
+    parser.add_argument("--baseline", help = "result file of an earlier run to compare with")
+    parser.add_argument("--threshold", type = float, default = 0.1, help = "relative change which counts as regression or gain")
+    args = parser.parse_args()
+    configs = grid({key: value_range(key, args.points) for key in args.keys})
+    rows = run(args.scenarios, configs, args.repeat, args.seed, progress = lambda name, config: print(name, config, flush = True),
+               backend = args.backend)
+    write(rows, args.out, args.repeat)
+    print(len(rows), "timings written to", args.out)
+    if args.baseline:
+        compared = compare(rows, read(args.baseline), args.threshold)
+        for row in compared:
+            print(describe(row), "%10.6f s  x%.2f %s" % (row["best"], row["ratio"], row["change"]))
+        regressions = [row for row in compared if row["change"] == "regression"]
+        print(len(compared), "compared,", len(regressions), "regressions,", len([row for row in compared if row["change"] == "gain"]), "gains")
+        if regressions:
+            sys.exit(1)
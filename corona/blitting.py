@@ -0,0 +1,63 @@
+"""the blitting layer of the window. the figure is only drawn as a whole after a resize or when the rooms have been rearranged,
+afterwards the background (everything that doesn't move) of every region is kept, a region being a part of the figure with animated
+artists in it (a room, the graph, the profile overlay). a region is redrawn by restoring its background, drawing its artists on top
+and blitting it onto the screen, so a frame only costs the regions which have changed."""
+
+
+class Blitter:
+    """the backgrounds of the regions of canvas. regions maps a key to a function returning the bbox of the region (in pixels),
+    the backgrounds are taken whenever the figure has been drawn as a whole (by draw or by the window after a resize).
+    fresh tells that this has just happened, so the animated artists of every region have to be drawn again"""
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.regions = {}
+        self.backgrounds = {}
+        self.valid = False
+        self.fresh = False
+        self.full_draws = 0
+        self.blits = 0
+        canvas.mpl_connect("draw_event", self.on_draw)
+        canvas.mpl_connect("resize_event", lambda event: self.invalidate())
+
+    def add(self, key, region):
+        self.regions[key] = region
+        self.invalidate()
+
+    def remove(self, key):
+        if self.regions.pop(key, None):
+            self.backgrounds.pop(key, None)
+            self.invalidate()
+
+    def invalidate(self):
+        """the backgrounds are outdated (the layout has changed), the next draw draws the whole figure"""
+        self.valid = False
+
+    def on_draw(self, event):
+        # savefig draws the animated artists as well, that's no background
+        if self.canvas.is_saving():
+            return
+        self.backgrounds = {}
+        for key, region in self.regions.items():
+            bbox = region()
+            self.backgrounds[key] = bbox, self.canvas.copy_from_bbox(bbox)
+        self.valid = True
+        self.fresh = True
+        self.full_draws += 1
+
+    def draw(self):
+        """draws the whole figure if the backgrounds are outdated, returns whether the animated artists have to be drawn again"""
+        if not self.valid:
+            self.canvas.draw()
+        fresh, self.fresh = self.fresh, False
+        return fresh
+
+    def update(self, key, artists):
+        """redraws the region key with the artists on top of its background"""
+        if key not in self.backgrounds:
+            return
+        bbox, background = self.backgrounds[key]
+        self.canvas.restore_region(background)
+        for artist in artists:
+            self.canvas.figure.draw_artist(artist)
+        self.canvas.blit(bbox)
+        self.blits += 1
@@ -0,0 +1,135 @@
+"""checkpoints: the whole state of a scenario (every array of the population, the rooms, the timers, the beds, the current frame
+and the state of the random number generator) is saved into one compressed .npz file and can be restored from it.
+fork restores many copies of one checkpoint, each with its own random numbers, to try what-if continuations from the same state."""
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from .population import Population
+from .rooms import Room
+from .scenarios import scenario_dict
+from .simulation import Simulation
+from .tiling import TiledScenario
+from .timeseries import TimeSeries
+
+# attributes of a scenario which are not part of its state
+not_saved = ["variables", "names", "observers", "rng", "population", "rooms", "list_of_infected", "data", "profiler", "events", "switches",
+             "edges", "connections", "processes", "in_transit"]
+
+
+def plain(value):
+    """value as something json can save, or None if it is not a plain value"""
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)) and all(isinstance(item, (bool, int, float, np.generic)) for item in value):
+        return [plain(item) for item in value]
+    return None
+
+
+def state(scenario):
+    """the state of the scenario as a dict of arrays (the way it is saved in the .npz file)"""
+    scenario.gather()
+    arrays = {"population " + name: getattr(scenario.population, name) for name in Population.fields}
+    attributes = {}
+    room_attributes = {}
+    for name, value in vars(scenario).items():
+        if name in not_saved:
+            continue
+        if isinstance(value, Room):
+            room_attributes[name] = value.id
+        elif plain(value) is not None or value is None:
+            attributes[name] = plain(value)
+    rooms = []
+    for room in scenario.rooms:
+        rooms.append({"actual_size": plain(room.actual_size), "border": plain(room.border), "title": room.title,
+                      "number_infected": plain(room.number_infected),
+                      "skin": room.neighbours.skin if room.neighbours else None, "exposure": room.exposure is not None,
+                      "exposure_frames": room.exposure_frames, "mean_field": room.mean_field})
+        arrays["room %d persons" % room.id] = np.asarray(room.persons, dtype = int)
+        arrays["room %d data" % room.id] = room.data.rows()
+        if room.exposure:
+            arrays["room %d exposure" % room.id] = np.concatenate(room.exposure)
+    arrays["list_of_infected"] = scenario.newly_infected()
+    arrays["data"] = scenario.data.rows()
+    meta = {"scenario": type(scenario).__name__, "attributes": attributes, "room attributes": room_attributes,
+            "rooms": rooms, "rng": scenario.rng.bit_generator.state, "switches": scenario.switches}
+    arrays["meta"] = np.array(json.dumps(meta))
+    return arrays
+
+
+def save(scenario, path):
+    """saves the whole state of the scenario into the .npz file path"""
+    np.savez_compressed(path, **state(scenario))
+
+
+def read(path):
+    """reads a checkpoint into memory (a dict of arrays)"""
+    with np.load(path) as file:
+        return {name: file[name] for name in file.files}
+
+
+def restore(arrays, seed = None):
+    """creates the scenario of a checkpoint (read by read). with a seed its random numbers are new ones from that seed,
+    otherwise they continue exactly like the ones of the saved scenario.
+    with a storage directory the arrays are copied into a new directory within it, so every restored copy has files of its own"""
+    meta = json.loads(str(arrays["meta"]))
+    classes = {cls.__name__: cls for cls in list(scenario_dict.values()) + [TiledScenario]}
+    restored = classes[meta["scenario"]]()
+    for name, value in meta["attributes"].items():
+        setattr(restored, name, value)
+    if seed is None:
+        restored.rng.bit_generator.state = meta["rng"]
+    else:
+        restored.rng = np.random.default_rng(seed)
+    storage = restored.storage
+    if storage and storage is not True:
+        # every restored copy gets files of its own (within storage), forks would write into each other's arrays otherwise
+        os.makedirs(storage, exist_ok = True)
+        storage = tempfile.mkdtemp(prefix = "restored-", dir = storage)
+    restored.population = Population(restored.rng, restored.compact, storage)
+    for name, dtype in restored.population.fields.items():
+        restored.population.store(name, arrays["population " + name].astype(dtype))
+    for room_id, saved in enumerate(meta["rooms"]):
+        room = Room(number_infected = saved["number_infected"], act_size = saved["actual_size"])
+        room.border = saved["border"]
+        room.title = saved["title"]
+        room.data = TimeSeries.from_counts(arrays["room %d data" % room_id])
+        room.set_persons(restored.population, arrays["room %d persons" % room_id])
+        if saved["exposure"]:
+            room.use_neighbour_list(saved["skin"])
+            room.exposure_frames = saved["exposure_frames"]
+            if "room %d exposure" % room_id in arrays:
+                room.exposure = [arrays["room %d exposure" % room_id]]
+        room.mean_field = saved.get("mean_field", False)
+        room.id = room_id
+        restored.rooms.append(room)
+    for name, room_id in meta["room attributes"].items():
+        setattr(restored, name, restored.rooms[room_id])
+    restored.list_of_infected = [arrays["list_of_infected"]]
+    restored.data = TimeSeries.from_counts(arrays["data"])
+    restored.switches = [tuple(switch) for switch in meta.get("switches", [])]
+    restored.schedule()
+    return restored
+
+
+def load(path, seed = None):
+    """restores the scenario saved in the .npz file path (see restore)"""
+    return restore(read(path), seed)
+
+
+def fork(path, number, seed = None, changes = None):
+    """restores number copies of the checkpoint path as Simulations, every one with its own stream of random numbers
+    (children of the SeedSequence of seed), so they branch off from the same state.
+    changes (keys of default_dict, e.g. {"infection rate": 0.1}) are taken over by every copy, just like changes of the sliders"""
+    arrays = read(path)
+    simulations = []
+    for child in np.random.SeedSequence(seed).spawn(number):
+        restored = restore(arrays, child)
+        if changes:
+            restored.change_values(changes)
+        simulations.append(Simulation(scenario = restored))
+    return simulations
@@ -0,0 +1,155 @@
+"""the contact kernel: finds every pair of persons of a room who are close enough to infect each other and decides who gets infected.
+everything is done on arrays: the persons are binned into cells which are a little bigger than the radius (by sorting),
+so only the persons of the neighbouring cells have to be compared."""
+import numpy as np
+
+
+def raster_cells(x, y):
+    """the cell of the discrete raster (one cell per unit of the room) a position is in"""
+    return x.astype(int), y.astype(int)
+
+
+def neighbouring_blocks(block_x, block_y, others, other_keys, rows, columns):
+    """returns every pair (p, o) of a person p and a person o of others which are in the same or in neighbouring blocks.
+    others has to be sorted by other_keys (block x * rows + block y), blocks outside of columns x rows are empty"""
+    all_p, all_o = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbour_x, neighbour_y = block_x + dx, block_y + dy
+            valid = np.flatnonzero((neighbour_x >= 0) & (neighbour_x < columns) & (neighbour_y >= 0) & (neighbour_y < rows))
+            keys = neighbour_x[valid] * rows + neighbour_y[valid]
+            start = np.searchsorted(other_keys, keys, side = "left")
+            counts = np.searchsorted(other_keys, keys, side = "right") - start
+            total = counts.sum()
+            if total == 0:
+                continue
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            all_p.append(np.repeat(valid, counts))
+            all_o.append(others[np.repeat(start, counts) + offsets])
+    if not all_p:
+        return np.zeros(0, dtype = int), np.zeros(0, dtype = int)
+    return np.concatenate(all_p), np.concatenate(all_o)
+
+
+def contact_pairs(x, y, size, radius):
+    """x, y are the positions of the persons that can infect or be infected (vulnerable and infected ones), in the order of their index.
+    returns the pairs (p, o) with o < p which are in contact (see checked_pairs) and the number of distances computed"""
+    width, height = int(size[0]), int(size[1])
+    rad_int = int(radius)
+    cell_x, cell_y = raster_cells(x, y)
+    # the cells of the list are rad_int + 1 raster cells wide, so every raster cell within rad_int is in a neighbouring one
+    block = rad_int + 1
+    columns, rows = -(-width // block), -(-height // block)
+    in_raster = (cell_x >= 0) & (cell_x < width) & (cell_y >= 0) & (cell_y < height)
+    others = np.flatnonzero(in_raster)
+    other_keys = (cell_x[others] // block) * rows + cell_y[others] // block
+    sorting = np.argsort(other_keys, kind = "stable")
+    others, other_keys = others[sorting], other_keys[sorting]
+
+    block_x = np.clip(np.floor_divide(cell_x, block), -1, columns)
+    block_y = np.clip(np.floor_divide(cell_y, block), -1, rows)
+    p, o = neighbouring_blocks(block_x, block_y, others, other_keys, rows, columns)
+
+    keep = o < p
+    return checked_pairs(p[keep], o[keep], x, y, size, radius)
+
+
+def checked_pairs(p, o, x, y, size, radius):
+    """keeps the pairs (p, o) that are in contact (the raster cell of o is within int(radius) cells of the one of p, the last row
+    and column of the raster are never looked at, and the distance is at most radius) and puts them in the order in which they
+    were always checked: by p, then by the raster cell of o (first x, then y), then by o. the number of distances computed
+    (for the profiler) is returned as well"""
+    width, height = int(size[0]), int(size[1])
+    rad_int = int(radius)
+    cell_x, cell_y = raster_cells(x, y)
+    i_min = np.maximum(cell_x[p] - rad_int, 0)
+    i_max = np.minimum(cell_x[p] + rad_int + 1, width - 1)
+    j_min = np.maximum(cell_y[p] - rad_int, 0)
+    j_max = np.minimum(cell_y[p] + rad_int + 1, height - 1)
+    keep = (i_min <= cell_x[o]) & (cell_x[o] < i_max) & (j_min <= cell_y[o]) & (cell_y[o] < j_max)
+    p, o = p[keep], o[keep]
+    checks = len(p)
+    keep = (x[p] - x[o])**2 + (y[p] - y[o])**2 <= radius**2
+    p, o = p[keep], o[keep]
+    order = np.lexsort((o, cell_y[o], cell_x[o], p))
+    return p[order], o[order], checks
+
+
+def resolve_infections(infected, p, o, coins):
+    """infected tells who of the persons (in the order of their index) is infected at the beginning of the day.
+    p, o are the pairs in contact and coins whether the infection happened for each pair (in the order of contact_pairs).
+    the persons are handled one after another by their index: an infected p infects o, a vulnerable p gets infected by an o
+    who is infected by now. returns who is infected at the end and who got infected while being handled themselves"""
+    number = len(infected)
+    p, o = p[coins], o[coins]
+    never = number
+    # time is the index of the person during whose handling someone got infected (-1 if they already were)
+    time = np.full(number, never)
+    time[infected] = -1
+    by_infected = infected[p]
+    np.minimum.at(time, o[by_infected], p[by_infected])
+    p, o = p[~by_infected], o[~by_infected]
+    got_infected = np.zeros(number, dtype = bool)
+    while True:
+        now = np.zeros(number, dtype = bool)
+        now[p[time[o] < p]] = True
+        if np.array_equal(now, got_infected):
+            break
+        got_infected = now
+        time[got_infected] = np.minimum(time[got_infected], np.flatnonzero(got_infected))
+    return time < never, got_infected
+
+
+def pairs_within(x, y, reach):
+    """returns every pair (p, o) with o < p whose distance is at most reach, found with a cell list of cells reach wide,
+    and the number of distances computed"""
+    if len(x) == 0:
+        return np.zeros(0, dtype = int), np.zeros(0, dtype = int), 0
+    block_x = np.floor(x / reach).astype(int)
+    block_y = np.floor(y / reach).astype(int)
+    block_x -= block_x.min()
+    block_y -= block_y.min()
+    columns, rows = block_x.max() + 1, block_y.max() + 1
+    keys = block_x * rows + block_y
+    others = np.argsort(keys, kind = "stable")
+    p, o = neighbouring_blocks(block_x, block_y, others, keys[others], rows, columns)
+    keep = o < p
+    p, o = p[keep], o[keep]
+    checks = len(p)
+    keep = (x[p] - x[o])**2 + (y[p] - y[o])**2 <= reach**2
+    return p[keep], o[keep], checks
+
+
+class NeighbourList:
+    """a verlet list: the pairs of persons of a room within radius + skin. between two frames everybody only moves a little,
+    so the list stays valid (every pair within radius is in it) until somebody moved more than half the skin since it was built.
+    it is also rebuilt when the persons of the room or the radius change. the pairs are positions in the list of persons of the room"""
+    def __init__(self, skin = 1):
+        self.skin = skin
+        self.persons = None
+        self.radius = None
+        self.built_x = None
+        self.built_y = None
+        self.p = None
+        self.o = None
+        self.rebuilds = 0
+
+    def is_valid(self, persons, x, y, radius):
+        if self.persons is None or radius != self.radius or not np.array_equal(persons, self.persons):
+            return False
+        if len(x) == 0:
+            return True
+        displacement = (x - self.built_x)**2 + (y - self.built_y)**2
+        return displacement.max() <= (self.skin / 2)**2
+
+    def update(self, persons, x, y, radius):
+        """x, y are the positions of persons (the persons of the room in their order), returns the pairs (p, o) of the list
+        and the number of distances computed to build it (0 if it was still valid)"""
+        checks = 0
+        if not self.is_valid(persons, x, y, radius):
+            self.p, self.o, checks = pairs_within(x, y, radius + self.skin)
+            self.persons = persons.copy()
+            self.radius = radius
+            self.built_x, self.built_y = x.copy(), y.copy()
+            self.rebuilds += 1
+        return self.p, self.o, checks
@@ -0,0 +1,49 @@
+"""monte carlo ensembles: the same configuration is simulated many times, every replicate with its own stream of random numbers
+(spawned from one master seed, so the whole ensemble can be reproduced), and the curves are summed up into mean and quantile bands."""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .simulation import Simulation
+
+
+def run_replicate(job):
+    """simulates one replicate, job is (config, days, seed). returns an array with one row per i, v, c, d"""
+    config, days, seed = job
+    simulation = Simulation(dict(config, seed = seed))
+    try:
+        series = simulation.run(days)
+    finally:
+        # a temporary storage and the workers of the tiles are gone with the replicate
+        simulation.close()
+    return np.array([series[char] for char in ["i", "v", "c", "d"]])
+
+
+class Ensemble:
+    """the curves of all replicates, curves has the shape (replicates, 4, days) (the 4 being i, v, c, d)"""
+    def __init__(self, curves, quantiles = (0.05, 0.25, 0.5, 0.75, 0.95)):
+        self.curves = curves
+        self.quantiles = quantiles
+
+    def mean(self):
+        """the mean of every curve, a dict of arrays just like Simulation.run returns"""
+        mean = self.curves.mean(axis = 0)
+        return {char: mean[n] for n, char in enumerate(["i", "v", "c", "d"])}
+
+    def bands(self):
+        """a dict from every quantile to the curves (a dict of arrays) of that quantile"""
+        values = np.quantile(self.curves, self.quantiles, axis = 0)
+        return {q: {char: value[n] for n, char in enumerate(["i", "v", "c", "d"])} for q, value in zip(self.quantiles, values)}
+
+
+def run_ensemble(config, days, replicates, seed = None, processes = None):
+    """simulates replicates replicates of config (see Simulation) for days days, concurrently in processes worker processes
+    (all cores by default, 0 runs them one after another in this process). every replicate gets its own child of the SeedSequence of seed"""
+    seeds = np.random.SeedSequence(seed).spawn(replicates)
+    jobs = [(config, days, child) for child in seeds]
+    if processes == 0:
+        curves = [run_replicate(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers = processes) as pool:
+            curves = list(pool.map(run_replicate, jobs))
+    return Ensemble(np.stack(curves))
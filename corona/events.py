@@ -0,0 +1,47 @@
+"""the event queue of the sub-scenarios: instead of looking at every person on every frame, the frame of the next jump, purchase
+or transfer of a person is put into a priority queue, so every frame only the persons who actually move are touched."""
+import heapq
+
+import numpy as np
+
+
+class EventQueue:
+    """the events of every frame are kept together as an array of persons (a bucket), the frames which have a bucket are on a heap.
+    pop(frame) takes out every person whose frame has come, in the order of their index
+    (the same order in which they used to be found by looking at everybody). an event costs the memory of one index"""
+    def __init__(self, frames = (), persons = ()):
+        self.buckets = {}
+        self.heap = []
+        self.push(frames, persons)
+
+    def __len__(self):
+        return sum(len(persons) for bucket in self.buckets.values() for persons in bucket)
+
+    def nbytes(self):
+        return sum(persons.nbytes for bucket in self.buckets.values() for persons in bucket)
+
+    def push(self, frames, persons):
+        """adds an event at frames[n] for every person persons[n]"""
+        frames, persons = np.asarray(frames, dtype = int), np.asarray(persons, dtype = int)
+        order = np.argsort(frames, kind = "stable")
+        frames, persons = frames[order], persons[order]
+        starts = np.flatnonzero(np.diff(frames, prepend = frames[:1] - 1))
+        for frame, group in zip(frames[starts].tolist(), np.split(persons, starts[1:])):
+            if frame not in self.buckets:
+                self.buckets[frame] = []
+                heapq.heappush(self.heap, frame)
+            self.buckets[frame].append(group)
+
+    def pop(self, frame):
+        """takes out the persons of every event up to frame, returns them sorted"""
+        due = [np.zeros(0, dtype = int)]
+        while self.heap and self.heap[0] <= frame:
+            due.extend(self.buckets.pop(heapq.heappop(self.heap)))
+        return np.unique(np.concatenate(due))
+
+    def remap(self, new_index):
+        """the persons of the population got new indices (see Population.remove), events of removed persons are dropped"""
+        for bucket in self.buckets.values():
+            for n, persons in enumerate(bucket):
+                persons = new_index[persons]
+                bucket[n] = persons[persons >= 0]
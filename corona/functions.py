@@ -1,6 +1,5 @@
 import math
 import numpy as np
-import random
 
 def get_ax_size(ax, fig):
     bbox = ax.get_window_extent().transformed(fig.dpi_scale_trans.inverted())
@@ -0,0 +1,70 @@
+"""the mean-field (compartment) version of the simulation: instead of looking at who is close to whom, the chance of a vulnerable
+person to get infected on a day is estimated from radius, speed, shape and members, as if everybody was spread evenly over the room.
+integrate runs the whole epidemic of the Standard scenario this way (with the same beds and death rates) in a few milliseconds,
+the hybrid mode of a scenario (see scenario.hybrid) uses infection_chance for the rooms with many infected.
+the contacts are estimated well, but the infected of the agents are close to each other, so the mean field gets the size of an
+epidemic about right (within a few percent of the persons) while its peak tends to be higher and earlier."""
+import numpy as np
+
+# how many radii a person has to walk in a day until half of their contacts are new ones (fitted to the agents)
+remeeting = 1.4
+
+
+def contact_chance(radius, shape, border = 2):
+    """the chance that two persons of a room are within radius of each other, for persons spread evenly within the border"""
+    area = (shape[0] - 2 * border) * (shape[1] - 2 * border)
+    return min(np.pi * radius**2 / area, 1)
+
+
+def mixing(radius, speed, frames_per_day):
+    """the share of the contacts of a day which are new ones. whoever walks little in a day compared to radius
+    meets the same persons again (who are infected already), without it the mean field would overestimate the infections"""
+    distance = speed * frames_per_day
+    return distance / (distance + remeeting * radius)
+
+
+def infection_chance(infected, vulnerable, radius, shape, infectionrate, speed, frames_per_day, border = 2):
+    """the chance of a vulnerable person to be infected on a day by any of the infected persons of their room (one coin per contact).
+    whoever gets infected can pass it on right away to the persons they are in contact with (see contacts.resolve_infections),
+    about half of them come later in the order, so every infected person counts 1 / (1 - branching) times"""
+    chance = contact_chance(radius, shape, border) * mixing(radius, speed, frames_per_day)
+    branching = min(infectionrate * vulnerable * chance / 2, 0.9)
+    return 1 - (1 - infectionrate) ** (infected * chance / (1 - branching))
+
+
+def integrate(scenario, days = 100):
+    """the epidemic of scenario (a scenario of the Standard kind, it doesn't need any rooms) as compartments. every room is the same,
+    so one room is followed: the vulnerable who will need a bed or not, the infected by their days of infection and by whether
+    they got a bed, need one without having it or don't need one, the cured and the deceased.
+    returns the expected number of infected, vulnerable, cured and deceased persons of every day (like Simulation.run),
+    for an epidemic which doesn't die out right at the start"""
+    rooms, members, days_infected = scenario.number_of_rooms, scenario.members, scenario.max_infected_time
+    need = scenario.bed_chance
+    beds = scenario.healthcare_max / rooms
+    # rows: in bed, needing a bed without one, not needing one. the columns are the infected days
+    infected = np.zeros((3, days_infected + 1))
+    first = min(scenario.number_infected, members)
+    infected[1:, 0] = first * need, first * (1 - need)
+    vulnerable = np.array([(members - first) * need, (members - first) * (1 - need)])
+    cured = deceased = 0.
+    series = {char: np.zeros(days) for char in "ivcd"}
+    for day in range(days):
+        chance = infection_chance(infected.sum(), vulnerable.sum(), scenario.radius, scenario.shape, scenario.infectionrate,
+                                  scenario.speed, scenario.frames_per_day)
+        new = vulnerable * chance
+        vulnerable = vulnerable - new
+        granted = min(new[0], max(beds, 0))
+        beds -= granted
+        infected[:, 0] += granted, new[0] - granted, new[1]
+        # one more day for everybody, whoever has been infected for days_infected days dies or is cured
+        infected[:, 1:] = infected[:, :-1].copy()
+        infected[:, 0] = 0
+        ending = infected[:, days_infected]
+        dying = ending * [scenario.deathrate, scenario.deathrate_without_healthcare, scenario.deathrate]
+        deceased += dying.sum()
+        cured += (ending - dying).sum()
+        beds += ending[0]
+        infected[:, days_infected] = 0
+        for char, count in zip("ivcd", [infected.sum(), vulnerable.sum(), cured, deceased]):
+            series[char][day] = count * rooms
+    return series
@@ -0,0 +1,210 @@
+"""the population store. instead of one python object per person, every property of every person is an entry of a numpy array,
+so that moving and counting can be done for everybody at once. a person is nothing more than an index into these arrays.
+for large populations (millions of persons) the arrays can be kept in compact dtypes and in memory-mapped files (see Population)."""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .backends import get_backend
+
+# the status of a person is stored as a small integer, the order is the same as the one of the colors in rooms
+I, V, C, D = 0, 1, 2, 3
+status_codes = {"i": I, "v": V, "c": C, "d": D}
+status_chars = "ivcd"
+
+# the dtypes of the large-population mode: single precision positions, the status as uint8 and the days as uint16
+compact_fields = {"x": np.float32,
+                  "y": np.float32,
+                  "angle": np.float32,
+                  "status": np.uint8,
+                  "infected_days": np.uint16,
+                  "purchase_interval": np.uint16,
+                  "home_x": np.float32,
+                  "home_y": np.float32}
+
+
+class Population:
+    """holds every person of a scenario, fields has the name and dtype of every array:
+    x, y is the position of a person in their room, angle the direction they are walking in (in turns, so between 0 and 1)
+    status is one of I, V, C, D and infected_days the days since the infection
+    room is the index of the room (in scenario.rooms) a person is in, slot their position in room.persons
+    will_need_bed is whether a person needs healthcare when infected, is_in_bed whether they get it
+    the remaining fields are only used by the sub-scenarios (jumpers, shoppers and the quarantine),
+    next_jump and next_trip are the frames (see scenario.frames) of the next jump and of the next way to or from the supermarket
+    rng is the np.random.Generator of the scenario.
+    with compact the fields take the smaller dtypes of compact_fields (about half the memory per person).
+    with storage (a directory, or True for a new temporary one) every array is a memory-mapped .npy file within it,
+    so the population can be larger than the memory, the system only keeps the parts in use"""
+    fields = {"x": np.float64,
+              "y": np.float64,
+              "angle": np.float64,
+              "status": np.int8,
+              "infected_days": np.int16,
+              "room": np.int32,
+              "slot": np.int32,
+              "will_need_bed": np.bool_,
+              "is_in_bed": np.bool_,
+              "jumpy": np.bool_,
+              "next_jump": np.int32,
+              "symptomatic": np.bool_,
+              "purchase_interval": np.int32,
+              "next_trip": np.int32,
+              "room_of_origin": np.int32,
+              "home_x": np.float64,
+              "home_y": np.float64}
+
+    def __init__(self, rng, compact = False, storage = None):
+        self.rng = rng
+        self.compact = compact
+        if compact:
+            self.fields = dict(self.fields, **compact_fields)
+        self.temporary = storage is True
+        if storage is True:
+            storage = tempfile.mkdtemp(prefix = "population-")
+        elif storage:
+            os.makedirs(storage, exist_ok = True)
+        self.storage = storage
+        self.files = {}
+        for name, dtype in self.fields.items():
+            self.store(name, np.zeros(0, dtype = dtype))
+
+    def __len__(self):
+        return len(self.status)
+
+    def new_array(self, name, size):
+        """a zeroed array for the field name, a memory-mapped file in storage if there is one"""
+        dtype = self.fields[name]
+        if not self.storage or size == 0:
+            return np.zeros(size, dtype = dtype)
+        # the file names alternate, so the new array never overwrites the one it is copied from
+        path = os.path.join(self.storage, "%s.%s.npy" % (name, "b" if self.files.get(name, "").endswith(".a.npy") else "a"))
+        return np.lib.format.open_memmap(path, mode = "w+", dtype = dtype, shape = (size,))
+
+    def store(self, name, array):
+        """makes array the field name, copied into a memory-mapped file if there is a storage"""
+        if self.storage and not isinstance(array, np.memmap) and len(array):
+            mapped = self.new_array(name, len(array))
+            mapped[:] = array
+            array = mapped
+        old = self.files.pop(name, None)
+        if isinstance(array, np.memmap):
+            self.files[name] = array.filename
+        setattr(self, name, array)
+        if old and old != self.files.get(name):
+            os.remove(old)
+
+    def resize(self, name, size):
+        """makes the field name size long, keeping its values (the new entries are zero)"""
+        old = getattr(self, name)
+        new = self.new_array(name, size)
+        new[:min(len(old), size)] = old[:size]
+        self.store(name, new)
+
+    def close(self):
+        """deletes a temporary storage, the population is not to be changed any more afterwards"""
+        if self.temporary:
+            shutil.rmtree(self.storage, ignore_errors = True)
+            self.files = {}
+            self.storage = None
+            self.temporary = False
+
+    def memory(self):
+        """the bytes of every field, their total, the bytes per person and how many of them are in memory-mapped files"""
+        fields = {name: getattr(self, name).nbytes for name in self.fields}
+        total = sum(fields.values())
+        return {"persons": len(self), "fields": fields, "bytes": total, "bytes per person": total / len(self) if len(self) else 0,
+                "mapped bytes": sum(getattr(self, name).nbytes for name in self.files)}
+
+    def add(self, room, number):
+        """adds number vulnerable persons at random positions in room, returns their indices"""
+        return self.add_rooms([room], number)[0]
+
+    def add_rooms(self, rooms, number):
+        """adds number vulnerable persons at random positions to every one of rooms, all at once.
+        returns their indices, one row per room"""
+        start = len(self)
+        total = len(rooms) * number
+        for name in self.fields:
+            self.resize(name, start + total)
+        new = slice(start, start + total)
+        room_ids = np.repeat([room.id for room in rooms], number)
+        self.status[new] = V
+        self.room[new] = room_ids
+        self.room_of_origin[new] = room_ids
+        self.angle[new] = self.rng.random(total)
+        border = np.repeat([float(room.border) for room in rooms], number)
+        for pos, axis in [(self.x, 0), (self.y, 1)]:
+            size = np.repeat([float(room.actual_size[axis]) for room in rooms], number)
+            pos[new] = border + self.rng.random(total) * (size - 2 * border)
+        return np.arange(start, start + total).reshape(len(rooms), number)
+
+    @classmethod
+    def record_dtype(cls):
+        """the dtype of the structured arrays of records (always the full dtypes, a compact population converts)"""
+        return np.dtype([(name, dtype) for name, dtype in cls.fields.items()])
+
+    def records(self, indices):
+        """returns the persons (indices) as a structured array with one field per array, e.g. to send them to another process"""
+        records = np.zeros(np.size(indices), dtype = self.record_dtype())
+        for name in self.fields:
+            records[name] = getattr(self, name)[indices]
+        return records
+
+    def append_records(self, records):
+        """adds the persons of a structured array made by records, returns their indices"""
+        start = len(self)
+        for name in self.fields:
+            self.resize(name, start + len(records))
+            getattr(self, name)[start:] = records[name]
+        return np.arange(start, len(self))
+
+    def remove(self, indices):
+        """removes the persons (indices), the others move up. returns the new index of every old index (-1 for the removed ones)"""
+        keep = np.ones(len(self), dtype = bool)
+        keep[indices] = False
+        for name in self.fields:
+            self.store(name, getattr(self, name)[keep])
+        return np.where(keep, np.cumsum(keep) - 1, -1)
+
+    def new_random_pos(self, indices, room):
+        """puts the persons (indices) at random positions within the border of room"""
+        indices = np.atleast_1d(indices)
+        number = len(indices)
+        self.x[indices] = room.border + self.rng.random(number) * (room.actual_size[0] - 2 * room.border)
+        self.y[indices] = room.border + self.rng.random(number) * (room.actual_size[1] - 2 * room.border)
+
+    def progress(self, max_infected_time, deathrate, deathrate_without_healthcare):
+        """the infected are one day longer infected, those infected for max_infected_time days die (with deathrate) or are cured.
+        whoever needs a bed and didn't get one dies with deathrate_without_healthcare. returns the number of beds that became free"""
+        infected = np.flatnonzero(self.status == I)
+        self.infected_days[infected] += 1
+        ending = infected[self.infected_days[infected] >= max_infected_time]
+        cared = self.is_in_bed[ending] | ~self.will_need_bed[ending]
+        dies = self.rng.random(len(ending)) <= np.where(cared, deathrate, deathrate_without_healthcare)
+        released = np.count_nonzero(self.is_in_bed[ending])
+        self.is_in_bed[ending] = False
+        self.status[ending] = np.where(dies, D, C)
+        return released
+
+    def keep_going(self, width, height, border, speed, backend = None, persons = None):
+        """makes every person (or only the persons, indices) walk one step. width, height and border are arrays with the values
+        of the room of each person. whoever is outside of the border turns around, everybody else changes their direction just a little.
+        the walking itself is done by backend (see backends.py, numpy without one)"""
+        backend = backend or get_backend()
+        if persons is not None:
+            x, y, angle = self.x[persons], self.y[persons], self.angle[persons]
+            angle_diff = self.rng.normal(0, 0.1, len(persons)).astype(angle.dtype, copy = False)
+            angle_diff[np.fabs(angle_diff) > 0.5] = 0
+            backend.walk(x, y, angle, angle_diff, width[persons], height[persons], border[persons], speed)
+            self.x[persons], self.y[persons], self.angle[persons] = x, y, angle
+            return
+        angle_diff = self.rng.normal(0, 0.1, len(self)).astype(self.angle.dtype, copy = False)
+        angle_diff[np.fabs(angle_diff) > 0.5] = 0
+        backend.walk(self.x, self.y, self.angle, angle_diff, width, height, border, speed)
+
+    def count(self, number_of_rooms):
+        """returns the number of infected, vulnerable, cured and deceased persons of every room (one row per room)"""
+        counts = np.bincount(self.room * 4 + self.status, minlength = 4 * number_of_rooms)
+        return counts.reshape(number_of_rooms, 4)
@@ -0,0 +1,115 @@
+"""timing of the phases of the simulation and of the window (movement, transfers, register, draw, layout, infection, beds, death, data).
+a scenario times its phases with its profiler, which is no_profiler (doing nothing) unless a Profiler is set.
+a Profiler sums up the time of every phase, counts the agent-steps (persons moved by one frame) and the contact checks
+(distances computed by the contact kernel, which the scenario reports after every contact search) and can write every phase as an event of a trace file
+in the chrome trace format (to be opened with chrome://tracing or https://ui.perfetto.dev)."""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+phases = ["movement", "transfers", "infection", "beds", "death", "data", "register", "draw", "layout"]
+
+
+class NoProfiler:
+    """the profiler of a scenario which is not profiled"""
+    def phase(self, name):
+        return nullcontext()
+
+    def steps(self, number):
+        pass
+
+    def checks(self, number):
+        pass
+
+    def day(self):
+        pass
+
+
+no_profiler = NoProfiler()
+
+
+class Profiler:
+    """sums up the time spent in every phase. with trace every phase is also kept as an event (at most max_events of them)"""
+    def __init__(self, trace = False, max_events = 1000000):
+        self.trace = trace
+        self.max_events = max_events
+        self.reset()
+
+    def reset(self):
+        self.totals = {}
+        self.calls = {}
+        self.events = []
+        self.dropped = 0
+        self.agent_steps = 0
+        self.days = 0
+        self.start = time.perf_counter()
+        self.distance_checks = 0
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.totals[name] = self.totals.get(name, 0) + end - start
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if self.trace:
+                self.event({"name": name, "cat": "phase", "ph": "X", "ts": (start - self.start) * 1e6, "dur": (end - start) * 1e6})
+
+    def event(self, event):
+        if len(self.events) < self.max_events:
+            event.update(pid = os.getpid(), tid = threading.get_ident())
+            self.events.append(event)
+        else:
+            self.dropped += 1
+
+    def steps(self, number):
+        """number persons have been moved by one frame"""
+        self.agent_steps += number
+
+    def checks(self, number):
+        """number distances have been computed by the contact kernel"""
+        self.distance_checks += number
+
+    def day(self):
+        """a day has ended, the contact checks so far are put into the trace as a counter"""
+        self.days += 1
+        if self.trace:
+            self.event({"name": "contact checks", "ph": "C", "ts": (time.perf_counter() - self.start) * 1e6,
+                        "args": {"per day": self.contact_checks() / self.days}})
+
+    def contact_checks(self):
+        return self.distance_checks
+
+    def summary(self):
+        """the seconds, calls and share of every phase, the agent-steps per second and the contact checks per day since the last reset"""
+        elapsed = time.perf_counter() - self.start
+        measured = sum(self.totals.values()) or 1
+        names = [name for name in phases if name in self.totals] + [name for name in self.totals if name not in phases]
+        return {"elapsed": elapsed, "days": self.days,
+                "phases": {name: {"seconds": self.totals[name], "calls": self.calls[name], "share": self.totals[name] / measured}
+                           for name in names},
+                "agent-steps per second": self.agent_steps / elapsed if elapsed else 0,
+                "contact checks per day": self.contact_checks() / self.days if self.days else 0}
+
+    def report(self):
+        """the summary as a small table"""
+        summary = self.summary()
+        lines = ["%-10s %9s %7s %9s %6s" % ("phase", "seconds", "calls", "ms/call", "share")]
+        for name, phase in summary["phases"].items():
+            lines.append("%-10s %9.3f %7d %9.3f %5.1f%%" % (name, phase["seconds"], phase["calls"],
+                                                          1000 * phase["seconds"] / phase["calls"], 100 * phase["share"]))
+        lines.append("%d days in %.1f s, %.0f agent-steps/s, %.0f contact checks/day" % (summary["days"], summary["elapsed"],
+                     summary["agent-steps per second"], summary["contact checks per day"]))
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        """writes the events into a trace file in the chrome trace format"""
+        names = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread.ident, "args": {"name": thread.name}}
+                 for thread in threading.enumerate()]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": names + self.events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped events": self.dropped}}, file)
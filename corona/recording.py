@@ -0,0 +1,247 @@
+"""recordings of runs: the position, status and room of every person on every frame (what Room.register draws), together with
+the rooms and the counts of every day, so a run can be drawn again later without simulating it (see render.py and replay.py).
+a recording is either kept in memory and saved as a .npz file at the end, or every frame is appended to a trajectory file
+right away (any other extension), which is memory-mapped when it is loaded, so a frame of an hour-long run is read from the disk
+only when it is shown. a trajectory file is a header (magic, length of the meta data and the meta data as json) followed by one
+record per frame: the counts of the last day, the number of days, then the columns x, y, room and status of every person.
+every record has the same size, so frame n starts at start + n * itemsize, and the days of the records are the index
+from a day to its frames. when the run is over the counts of every day (the last one has no record after it) follow the records
+as a trailer: the counts (<i8, 4 per day), the number of days (<u8) and the trailer mark. a trajectory which is still being
+written (or whose run crashed) has no trailer and can be loaded as well, without the counts of its last day."""
+import json
+import os
+
+import numpy as np
+
+from .population import Population
+from .profiling import no_profiler
+from .rooms import Room
+from .timeseries import TimeSeries
+
+
+class Recording:
+    """the frames of a run. x, y, status and room have one row per recorded frame and one column per person,
+    day is the number of days simulated before every frame and data the counts of every day (see TimeSeries.rows).
+    meta holds the rooms (their size, border and title) and the radius and healthcare_max of the scenario"""
+    def __init__(self, x, y, status, room, day, data, meta):
+        self.x = x
+        self.y = y
+        self.status = status
+        self.room = room
+        self.day = day
+        self.data = data
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.day)
+
+    def save(self, path):
+        """saves the recording into the .npz file path"""
+        np.savez(path, x = self.x, y = self.y, status = self.status, room = self.room, day = self.day, data = self.data,
+                 meta = np.array(json.dumps(self.meta)))
+
+    @classmethod
+    def load(cls, path):
+        """the recording of the .npz file path, or the memory-mapped recording of the trajectory file path"""
+        if not path.endswith(".npz"):
+            return cls.open(path)
+        with np.load(path) as file:
+            return cls(file["x"], file["y"], file["status"], file["room"], file["day"], file["data"], json.loads(str(file["meta"])))
+
+    @classmethod
+    def open(cls, path):
+        """the memory-mapped recording of the trajectory file path (see TrajectoryWriter), only the days and counts are read"""
+        with open(path, "rb") as file:
+            if file.read(len(magic)) != magic:
+                raise ValueError(path + " is no trajectory file")
+            length = int(np.frombuffer(file.read(8), dtype = "<u8")[0])
+            meta = json.loads(file.read(length))
+        dtype = trajectory_dtype(meta)
+        start = records_start(length)
+        data = read_trailer(path)
+        end = os.path.getsize(path) - (trailer_size(len(data)) if data is not None else 0)
+        frames = (end - start) // dtype.itemsize
+        records = np.memmap(path, dtype = dtype, mode = "r", offset = start, shape = (frames,)) if frames else np.zeros(0, dtype)
+        day = np.array(records["day"], dtype = int)
+        if data is None:
+            # the counts of day k are in the first record after it
+            first = np.searchsorted(day, np.arange(1, day.max() + 1 if frames else 1))
+            data = np.array(records["counts"][first])
+        return cls(records["x"], records["y"], records["status"], records["room"], day, data, meta)
+
+
+magic = b"corona trajectory 1\n"
+trailer_mark = b"corona counts 1\n"
+
+
+trajectory_columns = ["x", "y", "room", "status"]
+
+
+def trajectory_dtype(meta):
+    """the record of a frame in a trajectory file, meta holds the number of persons and the dtypes of the columns"""
+    persons = meta["persons"]
+    return np.dtype([("counts", "<i8", 4), ("day", "<i4")] + [(name, meta["dtypes"][name], persons) for name in trajectory_columns],
+                    align = True)
+
+
+def records_start(meta_length):
+    """the records start at a multiple of 64 bytes after the header"""
+    return -(-(len(magic) + 8 + meta_length) // 64) * 64
+
+
+def trailer_size(days):
+    return days * 4 * 8 + 8 + len(trailer_mark)
+
+
+def read_trailer(path):
+    """the counts of every day of the trailer of the trajectory file path, None if it has no trailer"""
+    with open(path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        if size < trailer_size(0):
+            return None
+        file.seek(size - trailer_size(0))
+        end = file.read()
+        if not end.endswith(trailer_mark):
+            return None
+        days = int(np.frombuffer(end[:8], dtype = "<u8")[0])
+        file.seek(size - trailer_size(days))
+        return np.frombuffer(file.read(days * 4 * 8), dtype = "<i8").reshape(days, 4).astype(int)
+
+
+def scenario_meta(scenario, every):
+    """what a recording needs to know about scenario besides the persons"""
+    return {"rooms": [{"size": [float(size) for size in room.actual_size], "border": float(room.border), "title": room.title}
+                      for room in scenario.rooms],
+            "radius": scenario.radius, "healthcare_max": int(scenario.healthcare_max), "frames_per_day": scenario.frames_per_day,
+            "every": every}
+
+
+class TrajectoryWriter:
+    """appends the frames of a scenario to the trajectory file path, the meta data is written right away"""
+    def __init__(self, path, scenario, every = 1):
+        population = scenario.population
+        self.meta = scenario_meta(scenario, every)
+        self.meta["persons"] = len(population)
+        room = np.uint16 if len(scenario.rooms) < 2**16 else np.int32
+        self.meta["dtypes"] = {"x": "<f4", "y": "<f4", "room": np.dtype(room).str, "status": "u1"}
+        text = json.dumps(self.meta).encode()
+        self.dtype = trajectory_dtype(self.meta)
+        self.record = np.zeros(1, self.dtype)
+        self.file = open(path, "wb")
+        self.file.write(magic + np.array([len(text)], dtype = "<u8").tobytes() + text)
+        self.file.write(bytes(records_start(len(text)) - self.file.tell()))
+
+    def write(self, scenario):
+        record = self.record[0]
+        data = scenario.data
+        record["counts"] = data.rows()[-1] if len(data) else 0
+        record["day"] = len(data)
+        population = scenario.population
+        for name in trajectory_columns:
+            record[name] = getattr(population, name)
+        self.file.write(self.record.tobytes())
+        # whoever loads the file while the run goes on sees every frame so far
+        self.file.flush()
+
+    def close(self, scenario = None):
+        """closes the file, with the counts of every day of scenario as the trailer"""
+        if scenario is not None:
+            rows = np.asarray(scenario.data.rows(), dtype = "<i8").reshape(-1, 4)
+            self.file.write(rows.tobytes() + np.array([len(rows)], dtype = "<u8").tobytes() + trailer_mark)
+        self.file.close()
+
+
+class Recorder:
+    """records a scenario while it runs, frame has to be called after every update_scatters (Simulation does that,
+    see its config key "record"). every records only every so many frames.
+    with a path which isn't a .npz file every frame is appended to that trajectory file instead of being kept in memory"""
+    def __init__(self, scenario, every = 1, path = None):
+        self.scenario = scenario
+        self.every = every
+        self.path = path
+        self.calls = 0
+        self.frames = []
+        self.persons = len(scenario.population)
+        self.writer = TrajectoryWriter(path, scenario, every) if path and not path.endswith(".npz") else None
+
+    def frame(self):
+        self.calls += 1
+        if (self.calls - 1) % self.every:
+            return
+        population = self.scenario.population
+        if len(population) != self.persons:
+            raise ValueError("the number of persons has changed, a recording needs the same persons on every frame")
+        if self.writer:
+            self.writer.write(self.scenario)
+            return
+        self.frames.append((population.x.astype(np.float32), population.y.astype(np.float32), population.status.astype(np.uint8),
+                            population.room.copy(), len(self.scenario.data)))
+
+    def recording(self):
+        """everything recorded so far as a Recording"""
+        if self.writer:
+            self.writer.file.flush()
+            return Recording.open(self.path)
+        scenario = self.scenario
+        columns = list(zip(*self.frames)) if self.frames else [[]] * 5
+        x, y, status, room = [np.array(column).reshape(len(self.frames), self.persons) for column in columns[:4]]
+        return Recording(x, y, status, room, np.array(columns[4], dtype = int), scenario.data.rows().copy(), scenario_meta(scenario, self.every))
+
+    def close(self):
+        """closes the trajectory file, or saves the recording into path"""
+        if self.writer:
+            self.writer.close(self.scenario)
+        elif self.path:
+            self.recording().save(self.path)
+
+
+class Replay:
+    """shows one frame of a recording at a time, with just what a FigureView needs of a scenario to draw it"""
+    def __init__(self, recording):
+        self.recording = recording
+        meta = recording.meta
+        self.rooms = []
+        for room_id, saved in enumerate(meta["rooms"]):
+            room = Room(number_infected = 0, act_size = tuple(saved["size"]))
+            room.border = saved["border"]
+            room.title = saved["title"]
+            room.id = room_id
+            self.rooms.append(room)
+        self.number_of_rooms = len(self.rooms)
+        self.shape = self.rooms[0].actual_size
+        self.radius = meta["radius"]
+        self.healthcare_max = meta["healthcare_max"]
+        self.frames_per_day = meta["frames_per_day"]
+        self.profiler = no_profiler
+        self.observers = []
+        self.population = Population(np.random.default_rng())
+        for name in Population.fields:
+            self.population.resize(name, recording.x.shape[1])
+        self.data = TimeSeries()
+        self.current = None
+
+    def show(self, frame):
+        """puts the persons where they were on frame (an index of the recording)"""
+        recording = self.recording
+        population = self.population
+        population.x[:], population.y[:] = recording.x[frame], recording.y[frame]
+        population.status[:] = recording.status[frame]
+        room = np.asarray(recording.room[frame])
+        if self.current is None or not np.array_equal(room, population.room):
+            population.room[:] = room
+            order = np.argsort(room, kind = "stable")
+            starts = np.searchsorted(room[order], np.arange(len(self.rooms) + 1))
+            for room_id, replayed in enumerate(self.rooms):
+                replayed.set_persons(population, order[starts[room_id]:starts[room_id + 1]])
+        day = int(recording.day[frame])
+        if day != len(self.data):
+            self.data = TimeSeries.from_counts(recording.data[:day])
+        self.current = frame
+
+    def frame_of_day(self, day):
+        """the first frame of day (the frames with day days simulated before them), the last frame for a day after the recording"""
+        return min(int(np.searchsorted(self.recording.day, day)), len(self.recording) - 1)
+
+    def update_relative_graph(self):
+        return self.data.relative_graph()
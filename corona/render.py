@@ -0,0 +1,111 @@
+"""the offline renderer: draws the frames of a recording (see recording.py) the way the window would (the same layout of the rooms,
+colors, auras and graph), without any window. the frames are split into one block per worker process, every worker draws its block
+with the Agg backend into png files, or into a piece of video which are joined at the end (needs ffmpeg). a .gif is made with pillow.
+just like in the window, only the rooms which have changed and (once a day) the graph are drawn again (see blitting.py).
+a recording comes from Simulation({"record": "run.traj", ...}) (or "run.npz"), every worker memory-maps a trajectory file.
+usage: python -m corona.render run.npz frames/            (png files)
+       python -m corona.render run.npz run.mp4 --fps 30"""
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from .recording import Recording, Replay
+from .view import FigureView
+
+
+def new_figure(dpi):
+    """a figure just like the one of the window (its left half is the graph, the right half the rooms)"""
+    fig = Figure(figsize = (11, 4), dpi = dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(2, 2, 1)
+    return fig, FigureView(fig, ax)
+
+
+def ffmpeg(*args):
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError("videos are made with ffmpeg, which is not installed (png files or a .gif don't need it)")
+    return ["ffmpeg", "-y", "-loglevel", "error"] + list(args)
+
+
+def render_block(job):
+    """draws the frames of a block, job is (path of the recording, frames, out, dpi, fps). out is a directory the png files
+    are written into, or the file of a piece of video"""
+    path, frames, out, dpi, fps = job
+    replay = Replay(Recording.load(path))
+    fig, view = new_figure(dpi)
+    view.attach(replay)
+    video = None
+    if not os.path.isdir(out):
+        width, height = fig.canvas.get_width_height()
+        video = subprocess.Popen(ffmpeg("-f", "rawvideo", "-pix_fmt", "rgba", "-s", "%dx%d" % (width, height), "-r", str(fps),
+                                        "-i", "-", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", out),
+                                 stdin = subprocess.PIPE)
+    day = None
+    for frame in frames:
+        replay.show(frame)
+        if replay.recording.day[frame] != day:
+            day = replay.recording.day[frame]
+            view.draw_graph(replay)
+        view.draw_rooms(replay)
+        if video:
+            video.stdin.write(fig.canvas.buffer_rgba())
+        else:
+            Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).save(os.path.join(out, "frame_%06d.png" % frame), compress_level = 1)
+    if video:
+        video.stdin.close()
+        if video.wait():
+            raise RuntimeError("ffmpeg failed on " + out)
+    return len(frames)
+
+
+def render(path, out, processes = None, fps = 30, dpi = 100, every = 1):
+    """draws every (every-th) frame of the recording path into out: a directory of png files, a .gif or a video (e.g. .mp4).
+    the frames are drawn concurrently in processes worker processes (all cores by default, 0 draws them in this process).
+    returns the number of frames drawn"""
+    frames = np.arange(0, len(Recording.load(path)), every)
+    workers = processes or os.cpu_count() or 1
+    blocks = [block for block in np.array_split(frames, workers) if len(block)]
+    gif = out.lower().endswith(".gif")
+    directory = not gif and not os.path.splitext(out)[1]
+    work = out if directory else tempfile.mkdtemp(prefix = "render-")
+    os.makedirs(work, exist_ok = True)
+    if directory or gif:
+        jobs = [(path, block, work, dpi, fps) for block in blocks]
+    else:
+        jobs = [(path, block, os.path.join(work, "piece %03d%s" % (n, os.path.splitext(out)[1])), dpi, fps) for n, block in enumerate(blocks)]
+    if processes == 0:
+        drawn = sum(render_block(job) for job in jobs)
+    else:
+        with ProcessPoolExecutor(max_workers = workers) as pool:
+            drawn = sum(pool.map(render_block, jobs))
+    if gif:
+        images = [Image.open(os.path.join(work, "frame_%06d.png" % frame)) for frame in frames]
+        images[0].save(out, save_all = True, append_images = images[1:], duration = 1000 / fps, loop = 0)
+    elif not directory:
+        pieces = os.path.join(work, "pieces.txt")
+        with open(pieces, "w") as file:
+            file.writelines("file '%s'\n" % job[2] for job in jobs)
+        subprocess.run(ffmpeg("-f", "concat", "-safe", "0", "-i", pieces, "-c", "copy", out), check = True)
+    if not directory:
+        shutil.rmtree(work)
+    return drawn
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "draws the frames of a recording (see recording.py) into png files or a video")
+    parser.add_argument("recording", help = "a trajectory file or a .npz file of a recording")
+    parser.add_argument("out", help = "a directory for png files, a .gif or a video file (.mp4, .webm, ..., needs ffmpeg)")
+    parser.add_argument("--processes", type = int, default = None, help = "worker processes, all cores by default, 0 for none")
+    parser.add_argument("--fps", type = int, default = 30)
+    parser.add_argument("--dpi", type = int, default = 100)
+    parser.add_argument("--every", type = int, default = 1, help = "draws only every so many frames")
+    args = parser.parse_args()
+    print(render(args.recording, args.out, args.processes, args.fps, args.dpi, args.every), "frames drawn into", args.out)
@@ -0,0 +1,108 @@
+"""the replay window: shows a recorded run (see recording.py) just like the simulator shows a running one, without simulating anything.
+a trajectory file is memory-mapped, so any frame of a long run is shown right away: the slider of the second window seeks to
+any day and scrubs backwards, the speed is the number of frames per tick (fractions for slow motion, negative plays backwards).
+keys of the main window: space plays and pauses, left and right go one frame, down and up one day back or forward.
+usage: python -m corona.replay run.traj
+       python -m corona.replay run.npz --day 40 --speed -2"""
+import argparse
+
+import matplotlib.pyplot as plt
+from matplotlib.widgets import Button, Slider
+
+from .recording import Recording, Replay
+from .view import FigureView
+
+parser = argparse.ArgumentParser(description = "shows a recorded run")
+parser.add_argument("recording", help = "a trajectory file or a .npz file of a recording")
+parser.add_argument("--day", type = float, default = 0, help = "the day to start at")
+parser.add_argument("--speed", type = float, default = 1, help = "frames per tick, negative plays backwards")
+args = parser.parse_args()
+
+replay = Replay(Recording.load(args.recording))
+frames = len(replay.recording)
+if not frames:
+    parser.error(args.recording + " has no frames")
+# recorded frames per day
+frames_per_day = replay.frames_per_day / replay.recording.meta["every"]
+
+# left and right go back and forward in the history of the zoom otherwise
+plt.rcParams["keymap.back"] = [key for key in plt.rcParams["keymap.back"] if key != "left"]
+plt.rcParams["keymap.forward"] = [key for key in plt.rcParams["keymap.forward"] if key != "right"]
+
+fig = plt.figure(figsize=(11,4))
+fig.patch.set_alpha(0.7)
+ax = fig.add_subplot(2,2,1)
+view = FigureView(fig, ax)
+
+playing = True
+position = float(replay.frame_of_day(int(args.day)))
+shown_day = None
+
+controls = plt.figure(figsize=(5, 2))
+position_slider = Slider(controls.add_axes([0.15, 0.7, 0.6, 0.15]), "day", 0, frames - 1, valinit = position)
+speed_slider = Slider(controls.add_axes([0.15, 0.45, 0.6, 0.15]), "speed", -16, 16, valinit = args.speed)
+play_button = Button(controls.add_axes([0.15, 0.1, 0.3, 0.2]), "play/pause")
+
+
+def show_position():
+    position_slider.valtext.set_text("%.1f" % (int(position) / frames_per_day))
+
+
+def update():
+    """is called by the timer of the window: moves on by speed frames when playing and draws the frame"""
+    global position, playing, shown_day
+    if playing:
+        position += speed_slider.val
+        if not 0 <= position <= frames - 1:
+            position = min(max(position, 0), frames - 1)
+            playing = False
+        # the slider shouldn't seek again
+        position_slider.eventson = False
+        position_slider.set_val(position)
+        position_slider.eventson = True
+        show_position()
+    frame = int(position)
+    if frame != replay.current:
+        replay.show(frame)
+    if shown_day != len(replay.data):
+        shown_day = len(replay.data)
+        view.draw_graph(replay)
+    view.draw_rooms(replay)
+
+
+def seek(value):
+    global position
+    position = value
+    show_position()
+
+
+def play(event = None):
+    global playing, position
+    playing = not playing
+    # at the end it starts all over again
+    if playing and (position >= frames - 1 and speed_slider.val > 0 or position <= 0 and speed_slider.val < 0):
+        position = 0 if speed_slider.val > 0 else frames - 1
+
+
+steps = {"left": -1, "right": 1, "down": -frames_per_day, "up": frames_per_day}
+
+
+def key(event):
+    if event.key == " ":
+        play()
+    elif event.key in steps:
+        position_slider.set_val(min(max(int(position) + steps[event.key], 0), frames - 1))
+
+
+replay.show(int(position))
+view.attach(replay)
+show_position()
+position_slider.on_changed(seek)
+play_button.on_clicked(play)
+fig.canvas.mpl_connect("key_press_event", key)
+
+timer = fig.canvas.new_timer(interval = 10)
+timer.add_callback(update)
+timer.start()
+
+plt.show()
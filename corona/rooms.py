@@ -0,0 +1,207 @@
+import numpy as np
+from .functions import *
+from .population import I, V
+from .contacts import NeighbourList
+from .timeseries import TimeSeries
+from .backends import get_backend
+
+radius_to_sice = 144
+radius = 0.5
+aura_on = True
+colors = {"i":'r',"v":'b',"c": 'g',"d": 'k'}
+
+
+def color_map():
+    """the colormap of the status of the persons and its norm. matplotlib is only imported once something is drawn,
+    a simulation without a window doesn't need it"""
+    from matplotlib.colors import ListedColormap, BoundaryNorm
+    cmap = ListedColormap(colors.values())
+    return cmap, BoundaryNorm([0,1,2,3,4], cmap.N)
+
+
+class Room:
+    """a room holds the indices (into the population) of the persons within it in persons, members is their number.
+    persons is the beginning of occupants, an array with spare space at its end, and population.slot is the position of every
+    person in the occupants of their room, so persons are added and taken out in constant time (see add_persons and remove_persons).
+    id is the index of the room in scenario.rooms, it is set by the scenario.
+    exposure collects the contacts of every frame if they are counted on every frame instead of only at the end of the day,
+    they are taken from neighbours, a NeighbourList (see use_neighbour_list),
+    mean_field is whether the infections are taken from the mean field instead of the contacts (see scenario.hybrid)"""
+    def __init__(self, number_infected, act_size = (3,4)):
+        #plot-stuff
+        self.border = 2
+        self.ax = None
+        self.divider = None
+        self.location_on_screen = (0.5,0)
+        self.size_on_screen = (1,1)
+        self.actual_size = act_size
+        if self.actual_size[0]<2*self.border or self.actual_size[1]<2*self.border:
+            raise ValueError("Everything is border")
+        self.boxpos = (0,0)
+        self.scale = 1
+        self.draw_data = [[],[],[]]
+        self.draw_data2 = [[],[],[]]
+        self.scatter = None
+        self.scatter2 = None
+        self.title = None
+
+        self.id = None
+        self.number_infected = number_infected
+
+        self.occupants = np.zeros(0, dtype = np.int32)
+        self.members = 0
+        self.data = TimeSeries(capacity = 64)
+
+        self.neighbours = None
+        self.exposure = None
+        self.exposure_frames = 0
+        self.mean_field = False
+
+    @property
+    def persons(self):
+        return self.occupants[:self.members]
+
+    def add_persons(self, population, persons):
+        """puts the persons (indices into population) at the end of the persons of this room"""
+        persons = np.atleast_1d(persons)
+        end = self.members + len(persons)
+        if end > len(self.occupants):
+            self.occupants = np.concatenate([self.occupants, np.zeros(max(end, 2 * len(self.occupants)) - len(self.occupants), dtype = np.int32)])
+        self.occupants[self.members:end] = persons
+        population.slot[persons] = np.arange(self.members, end)
+        self.members = end
+
+    def remove_persons(self, population, persons):
+        """takes the persons (indices into population) out of this room, the last persons move into the places that become free"""
+        persons = np.atleast_1d(persons)
+        end = self.members - len(persons)
+        slots = population.slot[persons]
+        free = slots[slots < end]
+        staying = np.ones(len(persons), dtype = bool)
+        staying[slots[slots >= end] - end] = False
+        moving = self.occupants[end:self.members][staying]
+        self.occupants[free] = moving
+        population.slot[moving] = free
+        self.members = end
+
+    def set_persons(self, population, persons):
+        """the persons (indices into population) are the persons of this room from now on"""
+        self.members = 0
+        self.add_persons(population, persons)
+
+    def use_neighbour_list(self, skin):
+        """from now on the contacts are counted on every frame (see record_exposure), taken from a neighbour list with the given skin"""
+        self.neighbours = NeighbourList(skin)
+        self.exposure = []
+
+    def update_data(self, counts):
+        """counts is the number of infected, vulnerable, cured and deceased persons of this room (see Population.count)"""
+        self.data.append(counts)
+
+    def calculate_infected(self, population, list_of_infected, radius, infectionrate, rng, backend = None):
+        """finds the persons in contact (see contacts.contact_pairs) and flips one coin for each pair.
+        the newly infected are appended to list_of_infected (as one array). the kernels are the ones of backend (see backends.py).
+        returns the number of distances computed (for the profiler)"""
+        backend = backend or get_backend()
+        persons = np.asarray(self.persons, dtype = int)
+        status = population.status[persons]
+        eligible = (status == V) | (status == I)
+        x, y = population.x[persons], population.y[persons]
+        chance = infectionrate
+        checks = 0
+        if self.exposure is not None:
+            p, o, chance = self.exposed_pairs(population, persons, eligible, infectionrate)
+        else:
+            p, o, checks = backend.contact_pairs(x[eligible], y[eligible], self.actual_size, radius)
+        coins = rng.random(len(p)) <= chance
+        persons = persons[eligible]
+        was_infected = status[eligible] == I
+        infected, got_infected = backend.resolve_infections(was_infected, p, o, coins)
+        newly_infected = persons[infected & ~was_infected]
+        population.status[newly_infected] = I
+        population.infected_days[newly_infected] = 0
+        list_of_infected.append(newly_infected)
+        return checks
+
+    def record_exposure(self, population, radius):
+        """remembers which of the vulnerable and infected persons are within radius of each other in this frame,
+        returns the number of distances computed"""
+        persons = np.asarray(self.persons, dtype = int)
+        x, y = population.x[persons], population.y[persons]
+        p, o, checks = self.neighbours.update(persons, x, y, radius)
+        status = population.status[persons]
+        eligible = (status == V) | (status == I)
+        keep = eligible[p] & eligible[o] & ((x[p] - x[o])**2 + (y[p] - y[o])**2 <= radius**2)
+        first, second = persons[o[keep]], persons[p[keep]]
+        self.exposure.append(np.minimum(first, second) * len(population) + np.maximum(first, second))
+        self.exposure_frames += 1
+        return checks + len(p)
+
+    def exposed_pairs(self, population, persons, eligible, infectionrate):
+        """the pairs of eligible persons which have been in contact during the day, handled in the order of their index.
+        the chance of a pair is higher the more frames of the day they spent within radius of each other"""
+        frames = self.exposure_frames
+        keys = np.concatenate(self.exposure) if self.exposure else np.zeros(0, dtype = int)
+        self.exposure = []
+        self.exposure_frames = 0
+        keys, counts = np.unique(keys, return_counts = True)
+        number = len(population)
+        rank = np.full(number, -1)
+        rank[persons[eligible]] = np.arange(np.count_nonzero(eligible))
+        first, second = rank[keys // number], rank[keys % number]
+        keep = (first >= 0) & (second >= 0)
+        p, o = np.maximum(first, second)[keep], np.minimum(first, second)[keep]
+        order = np.lexsort((o, p))
+        chance = 1 - (1 - infectionrate) ** (counts[keep][order] / max(frames, 1))
+        return p[order], o[order], chance
+
+    def compute_scale(self, fig):
+        a,b = get_ax_size(self.ax, fig)
+        if self.actual_size[0]/self.actual_size[1] > a/b:
+            self.size_on_screen = [a, (a/self.actual_size[0])*self.actual_size[1]]
+            self.scale = (a/self.actual_size[0])
+            self.boxpos = (0, (b-((a/self.actual_size[0])*self.actual_size[1]))/2)
+        else:
+            self.size_on_screen = [(b/self.actual_size[1])*self.actual_size[0], b]
+            self.scale = (b/self.actual_size[1])
+            self.boxpos = ((a-((b/self.actual_size[1])*self.actual_size[0]))/2, 0)
+
+    def show_on_fig(self, fig, rows, cols, index):
+        self.ax = fig.add_subplot(rows, cols, index, adjustable = "box", aspect = 1)
+        self.ax.get_xaxis().set_visible(False)
+        self.ax.get_yaxis().set_visible(False)
+        self.ax.axis("off")
+        self.ax.set_xlim(0, self.actual_size[0])
+        self.ax.set_ylim(0, self.actual_size[1])
+        self.scatter = None
+        self.scatter2 = None
+
+    def clear_room(self):
+        self.draw_data = [[], [], []]
+        self.draw_data2 = [[], [], []]
+
+    def register(self, population, infection_radius):
+        """puts the positions and colors of the persons in this room into draw_data (and the auras of the infected into draw_data2)"""
+        persons = np.asarray(self.persons, dtype = int)
+        x, y, status = population.x[persons], population.y[persons], population.status[persons]
+        infected = status == I
+        self.draw_data = [x, y, status + 0.5]
+        self.draw_data2 = [x[infected], y[infected], np.full(np.count_nonzero(infected), (infection_radius**2)*(self.scale**2)*radius_to_sice**2)]
+
+    def draw(self):
+        if not self.scatter:
+            cmap, norm = color_map()
+            self.scatter = self.ax.scatter(self.draw_data[0], self.draw_data[1], c = self.draw_data[2], s = (radius*radius_to_sice)**2*self.scale**2, cmap = cmap, norm = norm)
+            if aura_on:
+                self.scatter2 = self.ax.scatter(self.draw_data2[0], self.draw_data2[1], sizes = self.draw_data2[2], c = "r", alpha= 0.1)
+        else:
+            self.scatter.set_offsets(np.c_[self.draw_data[0], self.draw_data[1]])
+            self.scatter.set_array(np.array(self.draw_data[2]))
+            # one size for everybody (instead of one per person) lets matplotlib stamp the same marker everywhere, which is much faster
+            self.scatter.set_sizes([(radius*radius_to_sice)**2*self.scale**2])
+            if aura_on:
+                self.scatter2.set_offsets(np.c_[self.draw_data2[0], self.draw_data2[1]])
+                self.scatter2.set_sizes(np.array(self.draw_data2[2])[:1])
+        if aura_on:
+            return [self.scatter, self.scatter2]
+        return [self.scatter]
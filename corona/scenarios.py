@@ -0,0 +1,597 @@
+"""the scenarios of the simulator, without any plotting.
+a scenario only advances the rooms and persons within them. everything that is drawn on screen is done by observers
+(see view.py), which get told by the scenario when the rooms have changed."""
+import numpy as np
+
+from .rooms import Room
+from .population import Population, I, V, C, D
+from .timeseries import TimeSeries
+from .profiling import no_profiler
+from .events import EventQueue
+from .backends import get_backend
+from . import meanfield
+
+default_dict = {"number of rooms": [1,1,12,1],
+                "members": [300,1,500,1],
+                "number of infected": [1,1,50,1],
+                "deathrate": [0.1,0.1,1,0.1],
+                "deathrate without healthcare": [0.5,0.5,1,0.05],
+                "number of infected days": [7,1,21,1],
+                "infection rate": [0.2,0.1,1,0.1],
+                "shape": [50,1,100,1],
+                "radius": [2,0.5,5,0.1],
+                "speed": [0.5,0.1,5,0.1],
+                "healthcare max": [0.1,0.01,1,0.01],
+                "chance for bad infection": [0.05,0.01,1,0.01],
+                "percentage of jumpers": [0.01,0.01,1,0.01],
+                "time between jumps": [7,1,10,1],
+                "time between purchases": [7,1,14,1],
+                "chance for symptoms": [0.6,0.1,1,0.1]}
+
+
+def first_come(scenario, candidates):
+    """in the order in which they were found to be infected (room by room)"""
+    return candidates
+
+
+def lottery(scenario, candidates):
+    return scenario.rng.permutation(candidates)
+
+
+def symptomatic_first(scenario, candidates):
+    """the ones with symptoms first, then first come"""
+    return candidates[np.argsort(~scenario.population.symptomatic[candidates], kind = "stable")]
+
+
+# the orders in which the newly infected who need a bed get one (see scenario.calculate_beds)
+bed_priorities = {"first come": first_come, "random": lottery, "symptomatic first": symptomatic_first}
+
+
+def default_values():
+    """returns the default value of every key of default_dict (the same format as current_values in the gui)"""
+    return {key: default_dict[key][0] for key in default_dict}
+
+
+class scenario:
+    """this is the biggest class, governing the rooms and the population (more on those in the files rooms and population).
+    here you can adjust all the values which influence the simulation:
+    frames_per_day is the amount of moving that is beeing done before the next infection step takes place. imagine frames as hours and time steps as days.
+    number_infected is the staring number of infected persons per room
+    deathrate is the chance a person dies after beeing infected, while having access to healthcare
+    deathrate_without_healthcare is the same, just without healtcare
+    max_infected_time is how many time steps a person is going to be infected
+    infection_rate is the percentage that a person is infected, when a vulnerable person and an infecete person a close enough to each other
+    shape is the shape of the rooms
+    members is the amount of persons per room
+    radius is the radius in which person infects (or get infected by) persons (figuratively speaking a bigger radius translates to a higher amount of (the almost same) persons met)
+    speed is the distance that a person moves per update (figuratively speaking a higher speed translates to a higher amount of different persons met)
+    healthcare_max is the percentual amount of members. it represents the amount of people that can be treated by the healthcare system simultaniously
+    bed_chance is the chance that a given person needs healthcare in order to have high chances of survival when infected
+    exposure makes the contacts count on every frame, so the chance of an infection grows with the time spent close to each other.
+    they are taken from neighbour lists (see contacts.NeighbourList) with the skin neighbour_skin (6 * speed by default).
+    without exposure the contacts are searched from scratch once a day, a list would have to be rebuilt every day anyway
+    (everybody walks speed * frames_per_day in a day, far more than half of any skin which leaves a short list)
+    seed is anything np.random.default_rng takes (an int, a SeedSequence or a Generator), every random number of the scenario comes from rng
+    compact and storage are the large-population mode of the population: smaller dtypes and memory-mapped arrays (see Population)
+    hybrid is (above, below): a room in which the share of infected persons reaches above is switched to the mean field (see meanfield.py),
+    its persons stand still and the vulnerable are infected with the same chance, until the share falls below below.
+    switches are the points at which rooms were switched, (day, room id, "mean field" or "agents", infected persons)
+    """
+    # which key of default_dict belongs to which argument of __init__
+    value_keys = {"number of rooms": "number_of_rooms",
+                  "members": "members",
+                  "number of infected": "number_infected",
+                  "deathrate": "deathrate",
+                  "deathrate without healthcare": "deathrate_without_healthcare",
+                  "number of infected days": "max_infected_time",
+                  "infection rate": "infectionrate",
+                  "shape": "shape",
+                  "radius": "radius",
+                  "speed": "speed",
+                  "healthcare max": "healthcare_max",
+                  "chance for bad infection": "bed_chance"}
+    # keys of value_keys which only count when the rooms are created, update_variables leaves them as they are
+    fixed_keys = ["number of rooms", "members", "number of infected", "shape"]
+
+    def __init__(self, frames_per_day = 12, number_of_rooms = 1, number_infected = 1, deathrate = 0.1, deathrate_without_healthcare = 0.5, max_infected_time = 7, infectionrate = 0.2, shape = (50,50), members = 300, radius = 2, speed = 0.5, healthcare_max = 0.1, bed_chance = 0.05, neighbour_skin = None, exposure = False, seed = None, bed_priority = "first come", backend = "numpy", compact = False, storage = None, hybrid = None):
+        self.number_of_rooms = number_of_rooms
+        self.shape = shape
+        self.members = members
+        self.number_infected = number_infected
+        self.deathrate = deathrate
+        self.deathrate_without_healthcare = deathrate_without_healthcare
+        self.max_infected_time = max_infected_time
+        self.infectionrate = infectionrate
+        self.radius = radius
+        self.speed = speed
+        self.healthcare_max = int(members * healthcare_max * number_of_rooms)
+        self.bed_chance = bed_chance
+        self.neighbour_skin = neighbour_skin
+        self.exposure = exposure
+        self.bed_priority = bed_priority
+        self.backend = backend
+        self.compact = compact
+        self.storage = storage
+        self.hybrid = hybrid
+        self.switches = []
+
+        self.rng = np.random.default_rng(seed)
+        self.rooms = []
+        self.population = Population(self.rng, compact, storage)
+        self.observers = []
+        self.profiler = no_profiler
+        self.data = TimeSeries()
+        self.list_of_infected = []
+        self.beds = self.healthcare_max
+        self.frames_per_day = frames_per_day
+        self.current_frame = 0
+        self.frames = 0
+        self.variables = [self.rooms, self.members, self.number_infected, self.deathrate, self.deathrate_without_healthcare,
+                          self.max_infected_time, self.infectionrate, self.shape, self.radius, self.speed,
+                          self.healthcare_max, self.bed_chance]
+        self.names = ["number of rooms",
+                "members",
+                "number of infected",
+                "deathrate",
+                "deathrate without healthcare",
+                "number of infected days",
+                "infection rate",
+                "shape",
+                "radius",
+                "speed",
+                "healthcare max",
+                "chance for bad infection",
+                "percentage of jumpers",
+                "time between jumps",
+                "time between purchases",
+                "chance for symptoms"]
+
+    @classmethod
+    def from_values(cls, values, **kwargs):
+        """creates a scenario from a dict in the format of current_values (keys of default_dict), missing keys take their default"""
+        merged = default_values()
+        merged.update(values)
+        for key, argument in cls.value_keys.items():
+            if key == "shape":
+                kwargs[argument] = (merged[key], merged[key])
+            else:
+                kwargs[argument] = merged[key]
+        return cls(**kwargs)
+
+    @property
+    def kernels(self):
+        """the backend of the kernels (see backends.py), backend is its name"""
+        return get_backend(self.backend)
+
+    def memory(self):
+        """the memory used by the population, the rooms and the event queue, in total and per person"""
+        population = self.population.memory()
+        rooms = sum(room.occupants.nbytes for room in self.rooms)
+        events = self.events.nbytes() if getattr(self, "events", None) is not None else 0
+        total = population["bytes"] + rooms + events
+        persons = len(self.population)
+        return {"persons": persons, "population bytes": population["bytes"], "room bytes": rooms, "event bytes": events,
+                "bytes": total, "bytes per person": total / persons if persons else 0, "mapped bytes": population["mapped bytes"]}
+
+    def notify(self, event):
+        """tells every observer (for example the window) that something happened, event is the name of the method called on them"""
+        for observer in self.observers:
+            method = getattr(observer, event, None)
+            if method:
+                method(self)
+
+    def add_room(self, room):
+        """gives the room its id and adds it to the rooms"""
+        room.id = len(self.rooms)
+        if self.exposure:
+            # without a given skin the list stays valid for about three frames of walking
+            room.use_neighbour_list(self.neighbour_skin or 6 * self.speed)
+        self.rooms.append(room)
+
+    def create_rooms(self):
+        """initializes the rooms and persons within them, everybody is drawn at once"""
+        for l in range(self.number_of_rooms):
+            self.add_room(Room(number_infected=self.number_infected, act_size = self.shape))
+        persons = self.population.add_rooms(self.rooms, self.members)
+        for room, members in zip(self.rooms, persons):
+            room.add_persons(self.population, members)
+        self.population.status[self.pick(persons, self.number_infected)] = I
+        self.population.will_need_bed[self.pick(persons, int(self.bed_chance * self.members))] = True
+        self.notify("rooms_changed")
+
+    def pick(self, persons, number):
+        """number different persons of every row of persons (one row per room), drawn for all rooms at once"""
+        rooms, members = persons.shape
+        number = min(number, members)
+        if 2 * number > members:
+            return self.rng.permuted(persons, axis = 1)[:, :number].ravel()
+        # few of many: drawn with replacement, whoever was drawn twice is drawn again
+        chosen = self.rng.integers(members, size = (rooms, number))
+        while True:
+            chosen.sort(axis = 1)
+            twice = np.zeros(chosen.shape, dtype = bool)
+            twice[:, 1:] = chosen[:, 1:] == chosen[:, :-1]
+            if not twice.any():
+                return np.take_along_axis(persons, chosen, axis = 1).ravel()
+            chosen[twice] = self.rng.integers(members, size = np.count_nonzero(twice))
+
+    def new_room(self, size = None, title = None):
+        """adds another room to the already existing ones"""
+        if size:
+            shape = size
+        else:
+            shape = self.shape
+        specialroom = Room(number_infected=self.number_infected, act_size = shape)
+        specialroom.title = title
+        self.number_of_rooms += 1
+        self.add_room(specialroom)
+        self.notify("rooms_changed")
+        return specialroom
+
+    def room_geometry(self):
+        """returns the width, height and border of the room of every person (as arrays over the population)"""
+        dtype = self.population.x.dtype
+        width = np.array([room.actual_size[0] for room in self.rooms], dtype = dtype)
+        height = np.array([room.actual_size[1] for room in self.rooms], dtype = dtype)
+        border = np.array([room.border for room in self.rooms], dtype = dtype)
+        rooms = self.population.room
+        return width[rooms], height[rooms], border[rooms]
+
+    def update_scatters(self):
+        """update function, which makes every person move (except for the ones in mean-field rooms)"""
+        moving = self.moving()
+        with self.profiler.phase("movement"):
+            width, height, border = self.room_geometry()
+            self.population.keep_going(width, height, border, self.speed, self.kernels, moving)
+        self.profiler.steps(len(self.population) if moving is None else len(moving))
+        if self.exposure:
+            with self.profiler.phase("infection"):
+                for room in self.rooms:
+                    if not room.mean_field:
+                        self.profiler.checks(room.record_exposure(self.population, self.radius))
+        self.frames += 1
+
+    def moving(self):
+        """the persons who walk, None for everybody (no room is in the mean field)"""
+        if not any(room.mean_field for room in self.rooms):
+            return None
+        mean_field = np.array([room.mean_field for room in self.rooms])
+        return np.flatnonzero(~mean_field[self.population.room])
+
+    def schedule(self):
+        """puts the coming events of the persons into the event queue (the sub-scenarios have one), after a restore for example"""
+        pass
+
+    def gather(self):
+        """brings whatever is kept outside of the population back into it (the positions of a TiledScenario), before it is read"""
+        pass
+
+    def update_data(self):
+        """updates the data of the persons, ie.: who's infected, vulnerable, cured, deceased"""
+        counts = self.population.count(len(self.rooms))
+        for room in self.rooms:
+            room.update_data(counts[room.id])
+        self.data.append(counts.sum(axis = 0))
+        if self.hybrid:
+            self.switch_rooms(counts)
+
+    def update_relative_graph(self):
+        """computes the graph on the left, which shows the number of infected, cured vulnerable and deceased persons"""
+        return self.data.relative_graph()
+
+    def calculate_infected(self):
+        """calculates which persons are now infected on a room, by room basis"""
+        for room in self.rooms:
+            if room.mean_field:
+                self.mean_field_infected(room)
+            else:
+                self.profiler.checks(room.calculate_infected(self.population, self.list_of_infected, self.radius, self.infectionrate,
+                                                             self.rng, self.kernels))
+
+    def mean_field_infected(self, room):
+        """the infections of a room in the mean field: every vulnerable person is infected with the same chance (see meanfield.py)"""
+        persons = room.persons
+        status = self.population.status[persons]
+        vulnerable = persons[status == V]
+        chance = meanfield.infection_chance(np.count_nonzero(status == I), len(vulnerable), self.radius, room.actual_size,
+                                            self.infectionrate, self.speed, self.frames_per_day, room.border)
+        newly_infected = vulnerable[self.rng.random(len(vulnerable)) < chance]
+        self.population.status[newly_infected] = I
+        self.population.infected_days[newly_infected] = 0
+        self.list_of_infected.append(newly_infected)
+
+    def switch_rooms(self, counts):
+        """switches the rooms between agents and mean field by their share of infected persons (see hybrid), counts as in update_data"""
+        above, below = self.hybrid
+        for room in self.rooms:
+            infected = int(counts[room.id][I])
+            share = infected / max(room.members, 1)
+            if room.mean_field and share < below or not room.mean_field and share >= above:
+                room.mean_field = not room.mean_field
+                if room.exposure is not None:
+                    room.exposure, room.exposure_frames = [], 0
+                self.switches.append((len(self.data), room.id, "mean field" if room.mean_field else "agents", infected))
+
+    def newly_infected(self):
+        """the persons infected since the last time_step, in the order in which they were found"""
+        if not self.list_of_infected:
+            return np.zeros(0, dtype = int)
+        return np.concatenate(self.list_of_infected)
+
+    def allocate_beds(self, candidates, beds):
+        """the first beds of the candidates (newly infected) who need a bed, in the order of bed_priority, get one. returns them"""
+        candidates = candidates[self.population.will_need_bed[candidates]]
+        granted = bed_priorities[self.bed_priority](self, candidates)[:max(beds, 0)]
+        self.population.is_in_bed[granted] = True
+        return granted
+
+    def calculate_beds(self):
+        """calculates haw many places there are left in the healthcare system"""
+        self.beds -= len(self.allocate_beds(self.newly_infected(), self.beds))
+        self.list_of_infected.clear()
+
+    def calculate_death(self):
+        """calculates which persons are now deceased or cured (and free their beds)"""
+        self.beds += self.population.progress(self.max_infected_time, self.deathrate, self.deathrate_without_healthcare)
+
+    def time_step(self):
+        """calls all updating functions, every frames_per_day updates (that it only does it that often is not clear here, but in Simulation.day or the update of the gui)"""
+        with self.profiler.phase("infection"):
+            self.calculate_infected()
+        with self.profiler.phase("beds"):
+            self.calculate_beds()
+        with self.profiler.phase("death"):
+            self.calculate_death()
+        with self.profiler.phase("data"):
+            self.update_data()
+        self.profiler.day()
+
+    def jump(self, prsn, codomain, pos = None):
+        """makes one person (prsn, an index of the population) move from their room to another room (codmain) and if given to a certain position in that room (pos)"""
+        self.transfer([prsn], codomain, None if pos is None else ([pos[0]], [pos[1]]))
+
+    def transfer(self, persons, codomain, positions = None):
+        """makes many persons (indices of the population) move to the room codomain at once, positions are their x and y (random without)"""
+        self.relocate(persons, np.full(len(persons), codomain.id), positions)
+
+    def relocate(self, persons, room_ids, positions = None):
+        """makes many persons move at once, every one of them to their own room (room_ids), positions are their x and y (random without)"""
+        persons = np.asarray(persons, dtype = int)
+        if len(persons) == 0:
+            return
+        population = self.population
+        rooms = population.room[persons]
+        for room_id in np.unique(rooms):
+            self.rooms[room_id].remove_persons(population, persons[rooms == room_id])
+        for room_id in np.unique(room_ids):
+            arriving = persons[room_ids == room_id]
+            self.rooms[room_id].add_persons(population, arriving)
+            if positions is None:
+                population.new_random_pos(arriving, self.rooms[room_id])
+        population.room[persons] = room_ids
+        if positions is not None:
+            population.x[persons], population.y[persons] = positions
+
+    def transfer_home(self, persons):
+        """makes the persons go back to their room of origin, to the place they came from"""
+        population = self.population
+        self.relocate(persons, population.room_of_origin[persons], (population.home_x[persons], population.home_y[persons]))
+
+    def update_variables(self, values):
+        """takes over the values (format of current_values) which can be changed while the simulation is running"""
+        self.deathrate = values["deathrate"]
+        self.deathrate_without_healthcare = values["deathrate without healthcare"]
+        self.max_infected_time = values["number of infected days"]
+        self.infectionrate = values["infection rate"]
+        self.radius = values["radius"]
+        self.speed = values["speed"]
+        self.healthcare_max = values["healthcare max"] * values["number of rooms"] * values["members"]
+        self.bed_chance = values["chance for bad infection"]
+        for room in self.rooms:
+            room.border = 2 * int(self.speed) + 1
+        width, height, border = self.room_geometry()
+        for pos, size in [(self.population.x, width), (self.population.y, height)]:
+            below, above = pos < border, pos > size - border
+            pos[below] = border[below] + 1
+            pos[above] = size[above] - border[above] - 1
+
+    def values(self):
+        """the values of this scenario in the format of current_values"""
+        values = {key: getattr(self, argument) for key, argument in self.value_keys.items()}
+        values["shape"] = self.shape[0]
+        values["healthcare max"] = self.healthcare_max / (self.members * self.number_of_rooms)
+        return values
+
+    def change_values(self, changes):
+        """takes over the changed values (keys of default_dict), just like changing them with the sliders while the simulation runs"""
+        values = self.values()
+        values.update(changes)
+        self.update_variables(values)
+
+    def close(self):
+        """frees what the scenario keeps outside of its arrays (the storage of the population, see Population.close)"""
+        self.population.close()
+
+    def destroy(self):
+        """tells the observers that this scenario is no longer shown"""
+        self.notify("destroyed")
+
+
+
+
+
+class Cluster(scenario):
+    """a sub-scenario: it entails the inclusion of multiple rooms, which are separated from each other, by borders not crossable by the pathogen.
+    but there is also persons called jumpers, who can move between rooms on occasion"""
+    value_keys = dict(scenario.value_keys, **{"percentage of jumpers": "jumpy_percentage",
+                                              "time between jumps": "jumptime"})
+
+    def __init__(self, jumpy_percentage = 0.01, jumptime = 7, *args, **kwargs):
+        """jumpy_percentage is the percentage of persons who will later be able to 'jump'
+        jumptime is the time each 'jumper' takes inbetween jumps
+        events holds the next jump of every jumper"""
+        super().__init__(*args, **kwargs)
+        self.jumpy_percentage = jumpy_percentage
+        self.jumptime = jumptime
+        self.events = EventQueue()
+        self.variables.append(self.jumpy_percentage)
+        self.variables.append(self.jumptime)
+
+    def create_rooms(self):
+        """the room initialization needs to be updated with the new variables"""
+        super().create_rooms()
+        population = self.population
+        population.jumpy[:] = False
+        time_since_jump = (self.rng.random(len(population)) * self.jumptime).astype(int)
+        # everybody jumped time_since_jump frames ago
+        population.next_jump[:] = self.frames + self.jumptime - 1 - time_since_jump
+        persons = np.stack([room.persons for room in self.rooms])
+        population.jumpy[self.pick(persons, int(self.members * self.jumpy_percentage))] = True
+        self.schedule()
+
+    def schedule(self):
+        jumpers = np.flatnonzero(self.population.jumpy)
+        self.events = EventQueue(self.population.next_jump[jumpers], jumpers)
+
+    def due_jumpers(self):
+        """takes the jumpers whose jump is due out of the event queue and puts their next jump in"""
+        list_of_jumpers = self.events.pop(self.frames)
+        self.population.next_jump[list_of_jumpers] = self.frames + self.jumptime
+        self.events.push(self.population.next_jump[list_of_jumpers], list_of_jumpers)
+        return list_of_jumpers
+
+    def update_scatters(self):
+        """every movement update needs to be updated, so that jumpers actually jump"""
+        list_of_jumpers = self.due_jumpers()
+        destinations = self.rng.integers(len(self.rooms), size = len(list_of_jumpers))
+        with self.profiler.phase("transfers"):
+            self.relocate(list_of_jumpers, destinations)
+        return super().update_scatters()
+
+    def update_variables(self, values):
+        super().update_variables(values)
+        self.jumpy_percentage = values["percentage of jumpers"]
+        if values["time between jumps"] != self.jumptime:
+            # the time since the last jump stays the same, the jumps come earlier or later
+            jumpers = np.flatnonzero(self.population.jumpy)
+            next_jump = self.population.next_jump[jumpers] + values["time between jumps"] - self.jumptime
+            self.population.next_jump[jumpers] = np.maximum(next_jump, self.frames)
+            self.jumptime = values["time between jumps"]
+            self.schedule()
+
+
+class Supermarket(scenario):
+    """a sub-scenario: it entails the inclusion of a room called supermarket, where every person needs to go in certain intervals"""
+    value_keys = dict(scenario.value_keys, **{"time between purchases": "purchase_interval"})
+
+    def __init__(self, purchase_interval = 7, *args, **kwargs):
+        """shopping_time is the time every person is in the market
+        events holds the next way of every person to the market or back home"""
+        super().__init__(*args, **kwargs)
+        self.shopping_time = 1
+        self.purchase_interval = purchase_interval
+        self.events = EventQueue()
+        self.variables.append(self.shopping_time)
+
+    def create_rooms(self):
+        """purchase_interval is the time a person takes until they go to the supermarket again
+        room_of_origin is the room a person comes from (so that we can get them back to their neighbourhood)
+        home is the coordinates where a person comes from (so that we can get them back to their house)"""
+        super().create_rooms()
+        population = self.population
+        number = len(population)
+        population.purchase_interval[:] = self.purchase_interval + (self.rng.random(number) * 0.5 * self.purchase_interval - 0.25 * self.purchase_interval).astype(int)
+        time_since_purchase = (self.rng.random(number) * population.purchase_interval).astype(int)
+        population.next_trip[:] = self.frames + population.purchase_interval - 1 - time_since_purchase
+        population.room_of_origin[:] = population.room
+        population.home_x[:], population.home_y[:] = population.x, population.y
+        self.market = self.new_room(size = [10,15], title = "Supermercado")
+        self.schedule()
+
+    def schedule(self):
+        persons = np.arange(len(self.population))
+        self.events = EventQueue(self.population.next_trip, persons)
+
+    def update_scatters(self):
+        """makes persons acutally go to the supermarket and home again"""
+        population = self.population
+        due = self.events.pop(self.frames)
+        in_market = population.room[due] == self.market.id
+        list_of_leavers, list_of_thrifters = due[in_market], due[~in_market]
+        population.purchase_interval[list_of_leavers] = 50 + (self.rng.random(len(list_of_leavers)) * 20 - 2).astype(int)
+        # the next purchase is purchase_interval frames after coming home, the way home shopping_time frames after arriving
+        population.next_trip[list_of_leavers] = self.frames + population.purchase_interval[list_of_leavers]
+        population.next_trip[list_of_thrifters] = self.frames + self.shopping_time
+        self.events.push(population.next_trip[due], due)
+        with self.profiler.phase("transfers"):
+            self.transfer_home(list_of_leavers)
+            population.home_x[list_of_thrifters] = population.x[list_of_thrifters]
+            population.home_y[list_of_thrifters] = population.y[list_of_thrifters]
+            self.transfer(list_of_thrifters, self.market)
+        return super().update_scatters()
+
+    def update_variables(self, values):
+        super().update_variables(values)
+        self.purchase_interval = values["time between purchases"]
+
+
+class Quarantine(scenario):
+    """a sub-scenario: it entails the inclusion of a room called quarantine.
+    every person gets a chance to show symptoms, when they do they get moved to the quarantine room until they no longer infected."""
+    value_keys = dict(scenario.value_keys, **{"chance for symptoms": "symptom_chance"})
+
+    def __init__(self, symptom_chance = 0.6, *args, **kwargs):
+        """symptom_chance is the chance that a person that is infected shows symptoms (and is therefore put in quarantine)
+        events holds the persons who go into quarantine or home again on the next frame"""
+        super().__init__(*args, **kwargs)
+        self.symptom_chance = symptom_chance
+        self.events = EventQueue()
+        self.variables.append(self.symptom_chance)
+
+    def create_rooms(self):
+        """just like in the other sub-scenarios we need to initialize this"""
+        super().create_rooms()
+        population = self.population
+        population.room_of_origin[:] = population.room
+        population.home_x[:], population.home_y[:] = population.x, population.y
+        population.symptomatic[:] = self.rng.random(len(population)) <= self.symptom_chance
+        self.quarantine_room = self.new_room(title = "Quarantine")
+        self.schedule()
+
+    def schedule(self):
+        population = self.population
+        in_quarantine = population.room == self.quarantine_room.id
+        isolated = (population.status == I) & population.symptomatic & ~in_quarantine
+        released = in_quarantine & ((population.status == C) | (population.status == D))
+        persons = np.flatnonzero(isolated | released)
+        self.events = EventQueue(np.full(len(persons), self.frames), persons)
+
+    def time_step(self):
+        """the status only changes here: whoever got infected and shows symptoms goes into quarantine on the next frame,
+        whoever is no longer infected goes home"""
+        population = self.population
+        was_infected = population.status == I
+        super().time_step()
+        is_infected = population.status == I
+        in_quarantine = population.room == self.quarantine_room.id
+        persons = np.flatnonzero((~was_infected & is_infected & population.symptomatic & ~in_quarantine) |
+                                 (was_infected & ~is_infected & in_quarantine))
+        self.events.push(np.full(len(persons), self.frames), persons)
+
+    def update_scatters(self):
+        """this actually moves persons with symptoms into quarantine and to their homes again if no longer infected"""
+        population = self.population
+        due = self.events.pop(self.frames)
+        in_quarantine = population.room[due] == self.quarantine_room.id
+        with self.profiler.phase("transfers"):
+            self.transfer(due[~in_quarantine], self.quarantine_room)
+            self.transfer_home(due[in_quarantine])
+        return super().update_scatters()
+
+    def update_variables(self, values):
+        super().update_variables(values)
+        self.symptom_chance = values["chance for symptoms"]
+
+
+
+scenario_dict = {"Standard": scenario, "Supermarket": Supermarket, "Cluster": Cluster, "Quarantine": Quarantine}
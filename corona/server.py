@@ -0,0 +1,417 @@
+"""the streaming server: one headless simulation runs under an asyncio event loop and is watched by any number of viewers
+(a browser, or anything else which speaks WebSocket), instead of every viewer simulating a copy of its own.
+GET / is a small viewer page, GET /state the values and the counts of every day so far as json, /stream is the WebSocket.
+the server sends binary messages (little endian), their first byte tells their kind:
+  K keyframe: frame, day, persons and rooms (uint32), the width and height of every room (float32), then x, y (uint16,
+    in 65535ths of the width and height of their room), room (uint16) and status (uint8) of every person,
+    and i, v, c, d (uint32) of every day so far
+  D delta: frame, day, then the persons which have moved, changed their status and changed their room. each of them is the number
+    of persons (uint32), their indices (uint32) and their new values: x and y (uint16), status (uint8), room (uint16).
+    a delta changes the frame right before it. if more than half of the persons have changed, the values of every person are sent
+    instead and the indices are left out (the number is the number of persons then)
+  R row: the day which has just ended and its i, v, c, d (uint32)
+and text messages (json) with the values (keys of default_dict), whether it is paused and its frames per second when they change.
+the viewers send json: {"values": {"infection rate": 0.3, ...}} (just like the sliders of the window), {"pause": true}, {"fps": 60}.
+values which only count when the rooms are created (see scenario.fixed_keys), values outside of their sliders,
+an fps which is not a positive number or anything else wrong is answered with {"error": ...}.
+every viewer has a queue of at most backlog messages. the queue of a viewer which doesn't keep up is emptied and the viewer
+gets a keyframe as soon as it takes one, so a slow viewer skips frames instead of slowing down the simulation or the others.
+usage: python -m corona.server config.json --port 8765 --fps 30"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+
+import numpy as np
+
+from .scenarios import default_dict
+from .simulation import Simulation
+
+# see RFC 6455
+websocket_guid = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+text, binary, close, ping, pong = 0x1, 0x2, 0x8, 0x9, 0xA
+# the largest message a viewer may send
+max_message = 1 << 16
+
+
+def accept_key(key):
+    """the answer to the Sec-WebSocket-Key of the handshake"""
+    return base64.b64encode(hashlib.sha1(key.encode() + websocket_guid).digest()).decode()
+
+
+def websocket_frame(opcode, payload):
+    """payload as one (unmasked) frame from the server"""
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 1 << 16:
+        header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, "big")
+    return header + payload
+
+
+async def read_message(reader):
+    """the next message of a viewer as (opcode, payload), the frames of a fragmented message are joined"""
+    message, opcode = b"", None
+    while True:
+        first, second = await reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = int.from_bytes(await reader.readexactly(2), "big")
+        elif length == 127:
+            length = int.from_bytes(await reader.readexactly(8), "big")
+        if len(message) + length > max_message:
+            raise ValueError("message too long")
+        mask = await reader.readexactly(4) if second & 0x80 else b"\0\0\0\0"
+        payload = np.frombuffer(await reader.readexactly(length), dtype = np.uint8) ^ np.resize(np.frombuffer(mask, dtype = np.uint8), length)
+        if first & 0x0F >= close:
+            # control frames may come in between the fragments of a message
+            return first & 0x0F, payload.tobytes()
+        opcode = opcode or first & 0x0F
+        message += payload.tobytes()
+        if first & 0x80:
+            return opcode, message
+
+
+class FrameEncoder:
+    """turns the frames of a scenario into keyframes and deltas. the state of the last frame (as it is sent) is kept
+    to find the changes, together with the counts of every day so far"""
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.frame = 0
+        self.state = None
+        self.sizes = None
+        self.rows = []
+
+    def capture(self):
+        """the state of the current frame, returns the delta to the last one (None if there is none, then a keyframe is needed)"""
+        scenario = self.scenario
+        scenario.gather()
+        population = scenario.population
+        width, height, border = scenario.room_geometry()
+        new = {"x": np.clip(population.x / width * 65535, 0, 65535).astype("<u2"),
+               "y": np.clip(population.y / height * 65535, 0, 65535).astype("<u2"),
+               "status": population.status.astype("u1"),
+               "room": population.room.astype("<u2")}
+        old, self.state = self.state, new
+        self.sizes = np.array([room.actual_size for room in scenario.rooms], dtype = "<f4")
+        self.frame += 1
+        if old is None or len(old["x"]) != len(new["x"]):
+            return None
+        moved = np.flatnonzero((old["x"] != new["x"]) | (old["y"] != new["y"])).astype("<u4")
+        status = np.flatnonzero(old["status"] != new["status"]).astype("<u4")
+        room = np.flatnonzero(old["room"] != new["room"]).astype("<u4")
+        parts = [b"D", np.array([self.frame, len(self.rows)], dtype = "<u4").tobytes()]
+        everybody = len(new["x"])
+        for persons, names in [(moved, ["x", "y"]), (status, ["status"]), (room, ["room"])]:
+            # usually nearly everybody moves, their indices would take more space than their positions
+            if 2 * len(persons) > everybody:
+                parts.append(np.array([everybody], dtype = "<u4").tobytes())
+                parts.extend(new[name].tobytes() for name in names)
+            else:
+                parts.append(np.array([len(persons)], dtype = "<u4").tobytes() + persons.tobytes())
+                parts.extend(new[name][persons].tobytes() for name in names)
+        return b"".join(parts)
+
+    def new_rows(self):
+        """the row messages of the days which have ended since the last call"""
+        data = self.scenario.data
+        messages = []
+        while len(self.rows) < len(data):
+            row = data.rows()[len(self.rows)].astype("<u4")
+            messages.append(b"R" + np.array([len(self.rows)], dtype = "<u4").tobytes() + row.tobytes())
+            self.rows.append(row)
+        return messages
+
+    def keyframe(self):
+        state = self.state
+        header = np.array([self.frame, len(self.rows), len(state["x"]), len(self.sizes)], dtype = "<u4")
+        rows = np.array(self.rows, dtype = "<u4").reshape(len(self.rows), 4)
+        return b"".join([b"K", header.tobytes(), self.sizes.tobytes()] + [state[name].tobytes() for name in ["x", "y", "room", "status"]]
+                        + [rows.tobytes()])
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def check_value(scenario, key, value):
+    """raises ValueError unless key can be changed while scenario runs (see update_variables)
+    and value is a number which the slider of key (see default_dict) could have"""
+    if key not in default_dict:
+        raise ValueError("unknown value: %s" % key)
+    if key not in scenario.value_keys or key in scenario.fixed_keys:
+        raise ValueError("%s can not be changed while the simulation runs" % key)
+    start, low, high, step = default_dict[key]
+    if not is_number(value) or not low <= value <= high:
+        raise ValueError("%s is a number from %s to %s" % (key, low, high))
+    if isinstance(step, int) and value != int(value):
+        raise ValueError("%s is a whole number" % key)
+
+
+class Viewer:
+    """a connected viewer. synced is the frame of the last keyframe it got, older deltas and rows in its queue are skipped,
+    dropped counts the messages it has lost because it didn't keep up"""
+    def __init__(self, writer, backlog):
+        self.writer = writer
+        self.queue = asyncio.Queue(backlog)
+        self.synced = 0
+        self.dropped = 0
+        self.queue.put_nowait((None, "keyframe"))
+
+    def send(self, frame, message):
+        try:
+            self.queue.put_nowait((frame, message))
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            self.resync()
+
+    def resync(self):
+        """forgets everything in the queue, the viewer gets a keyframe next"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait((None, "keyframe"))
+
+
+class StreamServer:
+    """runs simulation (a Simulation) at fps frames per second (None for as fast as it can) and streams it to every viewer.
+    the frames are simulated on a thread of the executor, so the event loop keeps serving the viewers meanwhile.
+    changed values only take effect between two frames"""
+    def __init__(self, simulation, fps = 30, backlog = 8):
+        self.simulation = simulation
+        self.scenario = simulation.scenario
+        self.scenario.observers.append(self)
+        self.encoder = FrameEncoder(self.scenario)
+        self.fps = fps
+        self.backlog = backlog
+        self.viewers = set()
+        self.changes = {}
+        self.paused = False
+        self.rooms_have_changed = False
+        self.encoder.capture()
+
+    def rooms_changed(self, scenario):
+        # called on the thread of the simulation, the viewers get a keyframe after the frame
+        self.rooms_have_changed = True
+
+    def status(self):
+        return json.dumps({"values": self.scenario.values(), "paused": self.paused, "fps": self.fps}, default = lambda value: value.item())
+
+    def broadcast(self, frame, message):
+        for viewer in self.viewers:
+            viewer.send(frame, message)
+
+    async def run(self):
+        """simulates frame after frame, until it is cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            if self.changes:
+                changes, self.changes = self.changes, {}
+                before = self.scenario.values()
+                try:
+                    self.scenario.change_values(changes)
+                except Exception as error:
+                    # whatever a viewer sends, the simulation goes on for the others with the values before
+                    self.scenario.change_values(before)
+                    self.broadcast(None, json.dumps({"error": "%s: %s" % (type(error).__name__, error)}))
+                self.broadcast(None, self.status())
+            if not self.paused:
+                await loop.run_in_executor(None, self.simulation.frame)
+                delta = self.encoder.capture()
+                for message in self.encoder.new_rows():
+                    self.broadcast(self.encoder.frame, message)
+                if delta is None or self.rooms_have_changed:
+                    self.rooms_have_changed = False
+                    for viewer in self.viewers:
+                        viewer.resync()
+                else:
+                    self.broadcast(self.encoder.frame, delta)
+            await asyncio.sleep(max(1 / self.fps - (loop.time() - start), 0) if self.fps else 0)
+
+    def receive(self, message):
+        """takes over a message of a viewer, raises ValueError (and takes over nothing) if anything in it is wrong"""
+        message = json.loads(message)
+        if not isinstance(message, dict):
+            raise ValueError("a message is a json object")
+        values = message.get("values", {})
+        if not isinstance(values, dict):
+            raise ValueError("values is a json object")
+        for key, value in values.items():
+            check_value(self.scenario, key, value)
+        if "fps" in message and message["fps"] is not None and (not is_number(message["fps"]) or message["fps"] <= 0):
+            raise ValueError("fps is a positive number (or null for as fast as it can)")
+        self.changes.update(values)
+        if "pause" in message:
+            self.paused = bool(message["pause"])
+        if "fps" in message:
+            self.fps = message["fps"]
+        if "pause" in message or "fps" in message:
+            self.broadcast(None, self.status())
+
+    async def write(self, viewer):
+        """sends the queue of viewer, waits whenever the connection is slow (then the queue fills up and is dropped)"""
+        while True:
+            frame, message = await viewer.queue.get()
+            if message == "keyframe":
+                viewer.synced = self.encoder.frame
+                viewer.writer.write(websocket_frame(binary, self.encoder.keyframe()) + websocket_frame(text, self.status().encode()))
+            elif frame is None or frame > viewer.synced:
+                viewer.writer.write(websocket_frame(text, message.encode()) if isinstance(message, str) else websocket_frame(binary, message))
+            await viewer.writer.drain()
+
+    async def stream(self, reader, writer, headers):
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      "Sec-WebSocket-Accept: %s\r\n\r\n" % accept_key(headers["sec-websocket-key"])).encode())
+        viewer = Viewer(writer, self.backlog)
+        self.viewers.add(viewer)
+        sending = asyncio.create_task(self.write(viewer))
+        try:
+            while True:
+                opcode, payload = await read_message(reader)
+                if opcode == close:
+                    writer.write(websocket_frame(close, payload[:2]))
+                    break
+                if opcode == ping:
+                    writer.write(websocket_frame(pong, payload))
+                elif opcode == text:
+                    try:
+                        self.receive(payload.decode())
+                    except ValueError as error:
+                        writer.write(websocket_frame(text, json.dumps({"error": str(error)}).encode()))
+        finally:
+            self.viewers.discard(viewer)
+            sending.cancel()
+
+    def state(self):
+        return json.dumps({"values": self.scenario.values(), "frame": self.encoder.frame, "viewers": len(self.viewers),
+                           "days": np.array(self.encoder.rows).tolist()}, default = lambda value: value.item())
+
+    async def handle(self, reader, writer):
+        """answers a connection: the viewer page, the state or the WebSocket"""
+        try:
+            request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            path = request[0].split(" ")[1]
+            headers = dict((name.strip().lower(), value.strip()) for name, value in
+                           (line.split(":", 1) for line in request[1:] if ":" in line))
+            if path == "/stream" and headers.get("upgrade", "").lower() == "websocket" and "sec-websocket-key" in headers:
+                await self.stream(reader, writer, headers)
+            else:
+                pages = {"/": ("text/html", viewer_page), "/state": ("application/json", self.state())}
+                if path == "/stream":
+                    status, kind, body = "400 Bad Request", "text/plain", "a WebSocket handshake needs Upgrade and Sec-WebSocket-Key"
+                elif path in pages:
+                    status, (kind, body) = "200 OK", pages[path]
+                else:
+                    status, kind, body = "404 Not Found", "text/plain", "not found"
+                writer.write(("HTTP/1.1 %s\r\nContent-Type: %s; charset=utf-8\r\nContent-Length: %d\r\nConnection: close\r\n\r\n"
+                              % (status, kind, len(body.encode()))).encode() + body.encode())
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, IndexError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host = "127.0.0.1", port = 8765):
+        """serves the viewers and runs the simulation until it is cancelled"""
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            try:
+                await self.run()
+            finally:
+                self.simulation.close()
+
+
+viewer_page = """<!DOCTYPE html>
+<html><head><title>corona</title></head>
+<body style="font-family: sans-serif">
+<canvas id="rooms" width="900" height="600"></canvas>
+<p><span id="days"></span> <button id="pause">play/pause</button> <span id="info"></span></p>
+<script>
+const canvas = document.getElementById("rooms"), context = canvas.getContext("2d");
+const colors = ["red", "blue", "green", "black"];
+let x, y, room, status, sizes = [], rows = [], paused = false, dirty = false;
+const socket = new WebSocket("ws://" + location.host + "/stream");
+socket.binaryType = "arraybuffer";
+function take(buffer, offset, type, count) {
+  return new type(buffer.slice(offset, offset + count * type.BYTES_PER_ELEMENT));
+}
+socket.onmessage = event => {
+  if (typeof event.data === "string") {
+    const message = JSON.parse(event.data);
+    if ("paused" in message) paused = message.paused;
+    document.getElementById("info").textContent = event.data;
+    return;
+  }
+  const buffer = event.data, kind = String.fromCharCode(new Uint8Array(buffer, 0, 1)[0]);
+  const header = take(buffer, 1, Uint32Array, 4);
+  if (kind === "K") {
+    const n = header[2];
+    let offset = 17;
+    sizes = take(buffer, offset, Float32Array, 2 * header[3]); offset += 8 * header[3];
+    x = take(buffer, offset, Uint16Array, n); offset += 2 * n;
+    y = take(buffer, offset, Uint16Array, n); offset += 2 * n;
+    room = take(buffer, offset, Uint16Array, n); offset += 2 * n;
+    status = take(buffer, offset, Uint8Array, n); offset += n;
+    rows = Array.from({length: header[1]}, (_, day) => take(buffer, offset + 16 * day, Uint32Array, 4));
+  } else if (kind === "D" && x) {
+    let offset = 9;
+    for (const [arrays, types] of [[[x, y], [Uint16Array, Uint16Array]], [[status], [Uint8Array]], [[room], [Uint16Array]]]) {
+      const count = take(buffer, offset, Uint32Array, 1)[0], everybody = count === x.length;
+      const persons = everybody ? null : take(buffer, offset + 4, Uint32Array, count);
+      offset += everybody ? 4 : 4 + 4 * count;
+      arrays.forEach((array, k) => {
+        const values = take(buffer, offset, types[k], count);
+        offset += count * types[k].BYTES_PER_ELEMENT;
+        if (everybody) array.set(values);
+        else persons.forEach((person, n) => array[person] = values[n]);
+      });
+    }
+  } else if (kind === "R") {
+    rows.push(take(buffer, 5, Uint32Array, 4));
+  }
+  dirty = true;
+};
+function draw() {
+  if (dirty && x) {
+    dirty = false;
+    const rooms = sizes.length / 2, columns = Math.ceil(Math.sqrt(rooms)), lines = Math.ceil(rooms / columns);
+    const cell = Math.min(canvas.width / columns, canvas.height / lines);
+    context.clearRect(0, 0, canvas.width, canvas.height);
+    for (let person = 0; person < x.length; person++) {
+      const r = room[person], scale = (cell - 10) / Math.max(sizes[2 * r], sizes[2 * r + 1]);
+      context.fillStyle = colors[status[person]];
+      context.fillRect((r % columns) * cell + x[person] / 65535 * sizes[2 * r] * scale,
+                       Math.floor(r / columns) * cell + (1 - y[person] / 65535) * sizes[2 * r + 1] * scale, 3, 3);
+    }
+    const last = rows[rows.length - 1];
+    document.getElementById("days").textContent = "day " + rows.length + (last ? ": i " + last[0] + " v " + last[1] + " c " + last[2] + " d " + last[3] : "");
+  }
+  requestAnimationFrame(draw);
+}
+requestAnimationFrame(draw);
+document.getElementById("pause").onclick = () => socket.send(JSON.stringify({pause: !paused}));
+</script>
+</body></html>
+"""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "runs one simulation and streams it to every viewer which connects")
+    parser.add_argument("config", help = "json file with the config of the simulation (see simulation.py)")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--fps", type = float, default = 30, help = "frames per second, 0 for as fast as it can")
+    parser.add_argument("--backlog", type = int, default = 8, help = "messages kept for a viewer which doesn't keep up")
+    args = parser.parse_args()
+    with open(args.config) as file:
+        simulation = Simulation(json.load(file))
+    server = StreamServer(simulation, args.fps or None, args.backlog)
+    print("serving on http://%s:%d" % (args.host, args.port))
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,205 @@
+"""the Cluster scenario split over several processes. the rooms of a Cluster only interact through the jumpers, so every worker
+process advances its own group of rooms. after every frame the workers send the jumpers who leave for a room of another worker
+(as one small structured array) and the coordinator hands them to the worker of their new room. the beds of the healthcare
+system are shared by all rooms, so they are handed out by the coordinator in the same order as in a single Cluster."""
+import multiprocessing
+import os
+
+import numpy as np
+
+from .population import Population
+from .scenarios import Cluster, default_values
+from .simulation import options
+from .timeseries import TimeSeries
+
+
+class ShardCluster(Cluster):
+    """the rooms of one worker. room_ids are the global ids of its rooms (in the order of self.rooms), total_rooms is the number of all rooms.
+    jumpers that leave for a room of another worker are collected in emigrants instead of jumping"""
+    def __init__(self, room_ids, total_rooms, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.room_ids = list(room_ids)
+        self.local_ids = {global_id: local_id for local_id, global_id in enumerate(self.room_ids)}
+        self.total_rooms = total_rooms
+        self.emigrants = self.population.records([])
+
+    def update_scatters(self):
+        """just like Cluster.update_scatters, but the destination is one of all rooms"""
+        list_of_jumpers = self.due_jumpers()
+        destinations = self.rng.integers(self.total_rooms, size = len(list_of_jumpers))
+        leaving = np.array([destination not in self.local_ids for destination in destinations], dtype = bool)
+        with self.profiler.phase("transfers"):
+            local = np.array([self.local_ids[destination] for destination in destinations[~leaving]], dtype = int)
+            self.relocate(list_of_jumpers[~leaving], local)
+            self.emigrants = self.emigrate(list_of_jumpers[leaving], destinations[leaving])
+        return super(Cluster, self).update_scatters()
+
+    def emigrate(self, persons, destinations):
+        """takes the persons out of this worker, returns them as records whose room is the global id of their destination"""
+        records = self.population.records(persons)
+        records["room"] = destinations
+        if len(persons) == 0:
+            return records
+        rooms = self.population.room[persons]
+        for room_id in np.unique(rooms):
+            self.rooms[room_id].remove_persons(self.population, persons[rooms == room_id])
+        new_index = self.population.remove(persons)
+        self.events.remap(new_index)
+        for room in self.rooms:
+            room.set_persons(self.population, new_index[room.persons])
+        return records
+
+    def immigrate(self, records):
+        """adds the persons of the records (sent by another worker) to their rooms, at random positions"""
+        for global_id in np.unique(records["room"]):
+            room = self.rooms[self.local_ids[global_id]]
+            arriving = records[records["room"] == global_id]
+            arriving["room"] = room.id
+            persons = self.population.append_records(arriving)
+            self.population.new_random_pos(persons, room)
+            room.add_persons(self.population, persons)
+            self.events.push(self.population.next_jump[persons], persons)
+
+    def beds_needed(self):
+        """the number of newly infected who need a bed, per room (global id)"""
+        candidates = self.newly_infected()
+        needing = candidates[self.population.will_need_bed[candidates]]
+        counts = np.bincount(self.population.room[needing], minlength = len(self.rooms))
+        return {global_id: int(counts[local_id]) for local_id, global_id in enumerate(self.room_ids)}
+
+    def give_beds(self, granted):
+        """granted[room] of the newly infected who need a bed (per room, global id) get one, in the order of bed_priority"""
+        candidates = self.newly_infected()
+        rooms = self.population.room[candidates]
+        for local_id, global_id in enumerate(self.room_ids):
+            self.allocate_beds(candidates[rooms == local_id], granted[global_id])
+        self.list_of_infected.clear()
+
+
+def shard_worker(connection, config, room_ids, total_rooms, seed):
+    """the loop of a worker process, it answers the commands of the ShardedCluster on the other end of connection"""
+    values = dict(config, **{"number of rooms": len(room_ids)})
+    kwargs = {options[key]: value for key, value in values.items() if key in options}
+    kwargs["seed"] = seed
+    if isinstance(kwargs.get("storage"), str):
+        # every shard keeps its arrays in a directory of its own
+        kwargs["storage"] = os.path.join(kwargs["storage"], "shard %d" % room_ids[0])
+    shard = ShardCluster.from_values(values, room_ids = room_ids, total_rooms = total_rooms, **kwargs)
+    shard.create_rooms()
+    while True:
+        command, immigrants = connection.recv()
+        shard.immigrate(immigrants)
+        if command == "frame":
+            shard.update_scatters()
+            connection.send(shard.emigrants)
+        elif command == "infect":
+            shard.calculate_infected()
+            connection.send(shard.beds_needed())
+        elif command == "death":
+            # the beds granted per room follow right after the command
+            shard.give_beds(connection.recv())
+            shard.beds = 0
+            shard.calculate_death()
+            counts = shard.population.count(len(shard.rooms))
+            connection.send((shard.beds, {global_id: counts[local_id] for local_id, global_id in enumerate(room_ids)}))
+        elif command == "close":
+            connection.close()
+            return
+
+
+class ShardedCluster:
+    """a Cluster (config in the format of Simulation) whose rooms are spread over shards worker processes (all cores by default).
+    it is used like a Simulation: run(days) returns the time series of i, v, c, d"""
+    def __init__(self, config = None, shards = None):
+        self.config = default_values()
+        self.config["frames per day"] = 12
+        if config:
+            self.config.update(config)
+        if self.config.get("exposure"):
+            raise ValueError("exposure can not be split over processes, the contacts of the jumpers would be lost")
+        total_rooms = self.config["number of rooms"]
+        shards = min(shards or os.cpu_count() or 1, total_rooms)
+        self.frames_per_day = self.config["frames per day"]
+        self.healthcare_max = int(self.config["members"] * self.config["healthcare max"] * total_rooms)
+        self.beds = self.healthcare_max
+        self.data = TimeSeries()
+        self.groups = [list(group) for group in np.array_split(np.arange(total_rooms), shards)]
+        self.owner = np.zeros(total_rooms, dtype = int)
+        for shard, group in enumerate(self.groups):
+            self.owner[group] = shard
+        seeds = np.random.SeedSequence(self.config.get("seed")).spawn(shards)
+        self.connections = []
+        self.processes = []
+        for group, seed in zip(self.groups, seeds):
+            connection, worker_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target = shard_worker, args = (worker_end, self.config, group, total_rooms, seed), daemon = True)
+            process.start()
+            self.connections.append(connection)
+            self.processes.append(process)
+        self.in_transit = [self.empty_records() for connection in self.connections]
+
+    def empty_records(self):
+        return np.zeros(0, dtype = Population.record_dtype())
+
+    def command(self, command):
+        """sends the command (together with the persons in transit to each worker) to every worker and returns their answers"""
+        for connection, immigrants in zip(self.connections, self.in_transit):
+            connection.send((command, immigrants))
+        self.in_transit = [self.empty_records() for connection in self.connections]
+        return [connection.recv() for connection in self.connections]
+
+    def frame(self):
+        """moves every person for one frame and hands the jumpers to the workers of their new rooms"""
+        arriving = [[] for connection in self.connections]
+        for emigrants in self.command("frame"):
+            owners = self.owner[emigrants["room"]]
+            for shard in np.unique(owners):
+                arriving[shard].append(emigrants[owners == shard])
+        self.in_transit = [np.concatenate(records) if records else self.empty_records() for records in arriving]
+
+    def time_step(self):
+        """the infection step of every worker, then the beds are handed out in the order of the rooms and everybody recovers or dies"""
+        needed = {}
+        for answer in self.command("infect"):
+            needed.update(answer)
+        granted = {}
+        for global_id in sorted(needed):
+            granted[global_id] = min(needed[global_id], self.beds)
+            self.beds -= granted[global_id]
+        for connection in self.connections:
+            connection.send(("death", self.empty_records()))
+            connection.send(granted)
+        totals = np.zeros(4, dtype = int)
+        for connection in self.connections:
+            released, counts = connection.recv()
+            self.beds += released
+            for room_counts in counts.values():
+                totals += room_counts
+        self.data.append(totals)
+
+    def day(self):
+        for frame in range(self.frames_per_day):
+            self.frame()
+        self.time_step()
+
+    def run(self, days):
+        """simulates the given number of days and returns the time series of all days so far (one array per i, v, c, d)"""
+        for day in range(days):
+            self.day()
+        return self.series()
+
+    def series(self):
+        return {char: np.array(self.data[char]) for char in ["i", "v", "c", "d"]}
+
+    def close(self):
+        """stops the worker processes"""
+        for connection in self.connections:
+            connection.send(("close", self.empty_records()))
+        for process in self.processes:
+            process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,103 @@
+"""the headless simulation: runs a scenario without any window, so thousands of days can be simulated on a server."""
+import numpy as np
+
+from .scenarios import default_values, scenario_dict
+from .timeseries import open_sink
+from .profiling import Profiler
+from .recording import Recorder
+from .tiling import TiledScenario
+
+
+# the settings which are not in default_dict, they are passed on to the scenario as the argument of the same name
+options = {"frames per day": "frames_per_day",
+           "neighbour skin": "neighbour_skin",
+           "exposure": "exposure",
+           "seed": "seed",
+           "bed priority": "bed_priority",
+           "backend": "backend",
+           "compact": "compact",
+           "storage": "storage",
+           "hybrid": "hybrid"}
+
+
+class Simulation:
+    """advances a scenario day by day, without plotting anything.
+    config is a dict in the format of current_values (keys of default_dict), missing keys take their default.
+    additionally it can contain "scenario" (a key of scenario_dict), the keys of options, "output",
+    a .csv, .jsonl or .parquet file every day is written to as soon as it is simulated, and "profile",
+    a file the timings of the phases are written to when the simulation is closed (see profiling.py), and "record",
+    a file every frame (or every "record every" frames) is saved into when it is closed (a .npz file),
+    or appended to right away (a trajectory file, any other extension, see recording.py), and "tiles",
+    the number of worker processes the single room of a Standard scenario is split into (see tiling.py).
+    observers (for example a FigureView) can be passed, they are told about changes of the rooms just like in the gui.
+    instead of a config an already existing scenario can be given (e.g. one restored from a checkpoint), it is simply continued"""
+    def __init__(self, config = None, observers = (), scenario = None):
+        self.recorder = None
+        if scenario:
+            self.config = None
+            self.scenario = scenario
+            self.scenario.observers.extend(observers)
+            return
+        self.config = default_values()
+        self.config["scenario"] = "Standard"
+        self.config["frames per day"] = 12
+        if config:
+            self.config.update(config)
+        kwargs = {options[key]: value for key, value in self.config.items() if key in options}
+        kind = scenario_dict[self.config["scenario"]]
+        if self.config.get("tiles"):
+            if self.config["scenario"] != "Standard":
+                raise ValueError("only the room of the Standard scenario can be split into tiles")
+            kind, kwargs["tiles"] = TiledScenario, self.config["tiles"]
+        self.scenario = kind.from_values(self.config, **kwargs)
+        self.scenario.observers.extend(observers)
+        if self.config.get("output"):
+            self.scenario.data.sinks.append(open_sink(self.config["output"]))
+        if self.config.get("profile"):
+            self.scenario.profiler = Profiler(trace = True)
+        try:
+            self.scenario.create_rooms()
+        except Exception:
+            # whatever create_rooms has started (a temporary storage, the workers of the tiles) is not left behind
+            self.scenario.close()
+            raise
+        if self.config.get("record"):
+            self.recorder = Recorder(self.scenario, self.config.get("record every", 1), self.config["record"])
+            # the positions of the tiles have to be brought back for the recording
+            self.scenario.gathering = bool(self.config.get("tiles"))
+
+    def day(self):
+        """moves every person for the rest of the day and then does the time step"""
+        while self.scenario.current_frame < self.scenario.frames_per_day:
+            self.frame()
+        self.scenario.current_frame = 0
+        self.scenario.time_step()
+
+    def frame(self):
+        """moves every person once, if the day is over the time step comes first (just like in the window)"""
+        if self.scenario.current_frame >= self.scenario.frames_per_day:
+            self.scenario.current_frame = 0
+            self.scenario.time_step()
+        self.scenario.current_frame += 1
+        self.scenario.update_scatters()
+        if self.recorder:
+            self.recorder.frame()
+
+    def run(self, days):
+        """simulates the given number of days and returns the time series of all days so far (one array per i, v, c, d)"""
+        for day in range(days):
+            self.day()
+        return self.series()
+
+    def series(self):
+        """returns the number of infected, vulnerable, cured and deceased persons of every day simulated so far"""
+        return {char: np.array(self.scenario.data[char]) for char in ["i", "v", "c", "d"]}
+
+    def close(self):
+        """closes the output files, writes the trace of the profiler and saves the recording"""
+        self.scenario.data.close()
+        if self.recorder:
+            self.recorder.close()
+        self.scenario.close()
+        if self.config and self.config.get("profile"):
+            self.scenario.profiler.write_trace(self.config["profile"])
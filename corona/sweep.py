@@ -0,0 +1,130 @@
+"""parameter sweeps: runs many headless simulations with different values of default_dict in a pool of processes
+and collects a few numbers of every run into one table.
+usage: python -m corona.sweep members radius --points 5 --days 200 --out sweep.csv
+       python -m corona.sweep members radius speed --samples 1000 --days 200 --out sweep.csv   (latin hypercube)"""
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .population import I
+from .scenarios import default_dict
+from .simulation import Simulation
+
+# the smallest rooms of default_dict would be nothing but border
+smallest = {"shape": 5}
+
+
+def round_to_step(key, value):
+    """rounds value to the steps of the slider of key (just like the gui does)"""
+    start, low, high, step = default_dict[key]
+    value = low + round((value - low) / step) * step
+    value = min(max(value, low), high)
+    if step == 1:
+        return int(value)
+    return round(value, 10)
+
+
+def value_range(key, points = None):
+    """the values of key from min (or smallest) to max of default_dict, every step or in points equally spaced values"""
+    start, low, high, step = default_dict[key]
+    low = max(low, smallest.get(key, low))
+    if points:
+        values = np.linspace(low, high, points)
+    else:
+        values = np.arange(low, high + step / 2, step)
+    return sorted(set(round_to_step(key, value) for value in values))
+
+
+def grid(ranges):
+    """every combination of the values, ranges is a dict from keys of default_dict to lists of values"""
+    keys = list(ranges)
+    return [dict(zip(keys, combination)) for combination in itertools.product(*[ranges[key] for key in keys])]
+
+
+def latin_hypercube(keys, samples, seed = None):
+    """samples configurations: the range of every key is split into samples equal strata, every stratum is used once
+    and the strata of the different keys are paired randomly"""
+    rng = np.random.default_rng(seed)
+    configs = [{} for sample in range(samples)]
+    for key in keys:
+        start, low, high, step = default_dict[key]
+        low = max(low, smallest.get(key, low))
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        for config, fraction in zip(configs, strata):
+            config[key] = round_to_step(key, low + fraction * (high - low))
+    return configs
+
+
+def run_one(job):
+    """runs one configuration and returns its row of the table. job is (config, days, seed).
+    a run which fails (whatever the reason) doesn't end the sweep, its row has the error instead of the numbers"""
+    config, days, seed = job
+    row = dict(config)
+    row["seed"] = seed
+    simulation = None
+    try:
+        simulation = Simulation(dict(config, seed = seed))
+        population = simulation.scenario.population
+        overload_days = 0
+        for day in range(days):
+            simulation.day()
+            # somebody needs a bed but didn't get one
+            if np.any((population.status == I) & population.will_need_bed & ~population.is_in_bed):
+                overload_days += 1
+        infected = simulation.series()["i"]
+        row["peak infected"] = int(infected.max())
+        row["time to peak"] = int(infected.argmax())
+        row["final deaths"] = int(simulation.series()["d"][-1])
+        row["overload days"] = overload_days
+    except Exception as error:
+        row["error"] = "%s: %s" % (type(error).__name__, error)
+    finally:
+        # a temporary storage and the workers of the tiles are gone with the run
+        if simulation:
+            simulation.close()
+    return row
+
+
+def sweep(configs, days, base = None, processes = None, seed = None):
+    """runs every configuration (dicts of keys of default_dict, base is added to each of them) for days days
+    in processes worker processes (all cores by default). returns one row (a dict) per configuration"""
+    seeds = np.random.SeedSequence(seed).generate_state(len(configs))
+    jobs = [(dict(base or {}, **config), days, int(run_seed)) for config, run_seed in zip(configs, seeds)]
+    with ProcessPoolExecutor(max_workers = processes) as pool:
+        return list(pool.map(run_one, jobs, chunksize = max(1, len(jobs) // (4 * (processes or os.cpu_count() or 1)))))
+
+
+def write_table(rows, path):
+    """writes the rows into a csv file"""
+    fieldnames = []
+    for row in rows:
+        fieldnames += [key for key in row if key not in fieldnames]
+    with open(path, "w", newline = "") as file:
+        writer = csv.DictWriter(file, fieldnames = fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "runs the simulation for many values of the parameters of default_dict")
+    parser.add_argument("keys", nargs = "+", help = "keys of default_dict to sweep over (use quotes for keys with spaces)")
+    parser.add_argument("--points", type = int, help = "number of values per key of the grid (default: every step of the slider)")
+    parser.add_argument("--samples", type = int, help = "latin hypercube with this many samples instead of a grid")
+    parser.add_argument("--scenario", default = "Standard")
+    parser.add_argument("--days", type = int, default = 100)
+    parser.add_argument("--processes", type = int)
+    parser.add_argument("--seed", type = int)
+    parser.add_argument("--out", default = "sweep.csv")
+    args = parser.parse_args()
+    if args.samples:
+        configs = latin_hypercube(args.keys, args.samples, args.seed)
+    else:
+        configs = grid({key: value_range(key, args.points) for key in args.keys})
+    rows = sweep(configs, args.days, base = {"scenario": args.scenario}, processes = args.processes, seed = args.seed)
+    write_table(rows, args.out)
+    failed = sum("error" in row for row in rows)
+    print(len(rows), "runs written to", args.out, "(%d failed)" % failed if failed else "")
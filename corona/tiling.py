@@ -0,0 +1,236 @@
+"""one big room split over several processes. the room of a Standard scenario is cut into tiles (strips along x), every worker
+process moves the persons of its tile and hands the persons who walked over its edges to the workers of their new tiles.
+before the infection step every worker sends the vulnerable and infected persons within radius of its edges (the halo),
+the others get the ones within radius of their tile, so every worker finds the contacts of its own persons (see contacts.contact_pairs)
+just as if it had the whole room. the coins are flipped and the infections are resolved (see contacts.resolve_infections)
+by the scenario itself, over the contacts of all tiles in the order of the persons, everything else (beds, deaths, the data)
+is done there as well. the walks and the coins come from other random numbers than without tiles, so the results match
+the ones of a single process statistically, not exactly."""
+import multiprocessing
+import os
+
+import numpy as np
+
+from .backends import get_backend
+from .population import I, V
+from .scenarios import scenario
+
+
+def tile_records(dtype, size = 0):
+    """the persons of a tile (or in transit between tiles): their index in the population, position and direction"""
+    return np.zeros(size, dtype = [("id", np.int64), ("x", dtype), ("y", dtype), ("angle", dtype)])
+
+
+class Tile:
+    """the persons of one tile of the room, whose x is within low and high. status is the status of everybody (of the whole room),
+    as of the last infection step"""
+    def __init__(self, low, high, size, dtype, backend, seed):
+        self.low = low
+        self.high = high
+        self.size = size
+        self.kernels = get_backend(backend)
+        self.rng = np.random.default_rng(seed)
+        self.persons = tile_records(dtype)
+        self.status = None
+
+    def add(self, records):
+        self.persons = np.concatenate([self.persons, records])
+
+    def walk(self, speed, border):
+        """one step of everybody (just like Population.keep_going), returns the persons who left the tile (and takes them out)"""
+        persons = self.persons
+        x, y, angle = persons["x"], persons["y"], persons["angle"]
+        number = len(persons)
+        angle_diff = self.rng.normal(0, 0.1, number).astype(angle.dtype, copy = False)
+        angle_diff[np.fabs(angle_diff) > 0.5] = 0
+        self.kernels.walk(x, y, angle, angle_diff, np.full(number, self.size[0], dtype = x.dtype),
+                          np.full(number, self.size[1], dtype = x.dtype), np.full(number, border, dtype = x.dtype), speed)
+        persons["x"], persons["y"], persons["angle"] = x, y, angle
+        leaving = (x < self.low) | (x >= self.high)
+        self.persons = persons[~leaving]
+        return persons[leaving]
+
+    def eligible(self):
+        """the vulnerable and infected persons of the tile"""
+        status = self.status[self.persons["id"]]
+        return self.persons[(status == V) | (status == I)]
+
+    def halo(self, radius):
+        """the vulnerable and infected persons within radius of the edges of the tile"""
+        persons = self.eligible()
+        x = persons["x"]
+        return persons[(x < self.low + radius) | (x >= self.high - radius)]
+
+    def contacts(self, ghosts, radius):
+        """the pairs (p, o) of persons in contact (their indices in the population, o < p) with p in this tile
+        and the number of distances computed. ghosts are the persons of the other tiles within radius of this one"""
+        own = self.eligible()
+        persons = np.concatenate([own, ghosts])
+        # in the order of the population, just like the persons of the room
+        persons = persons[np.argsort(persons["id"], kind = "stable")]
+        owned = persons["x"] >= self.low
+        owned &= persons["x"] < self.high
+        p, o, checks = self.kernels.contact_pairs(persons["x"], persons["y"], self.size, radius)
+        keep = owned[p]
+        return persons["id"][p[keep]], persons["id"][o[keep]], checks
+
+
+def tile_worker(connection, low, high, size, dtype, backend, seed):
+    """the loop of a worker process, it answers the commands of the TiledScenario on the other end of connection"""
+    tile = Tile(low, high, size, dtype, backend, seed)
+    while True:
+        command, payload = connection.recv()
+        if command == "add":
+            tile.add(payload)
+        elif command == "frame":
+            immigrants, speed, border = payload
+            tile.add(immigrants)
+            connection.send(tile.walk(speed, border))
+        elif command == "halo":
+            tile.status, radius = payload
+            connection.send(tile.halo(radius))
+        elif command == "infect":
+            ghosts, radius = payload
+            connection.send(tile.contacts(ghosts, radius))
+        elif command == "replace":
+            tile.persons = payload
+        elif command == "positions":
+            connection.send(tile.persons)
+        elif command == "close":
+            connection.close()
+            return
+
+
+class TiledScenario(scenario):
+    """the Standard scenario with a single room, which is split into tiles worker processes (all cores by default) when the room
+    is created. the positions stay with the workers, with gathering they are brought back into the population after every frame
+    (for a recording or a window), gather does it once (before a checkpoint or a stream frame for example).
+    neither exposure nor hybrid can be used with tiles"""
+    def __init__(self, tiles = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tiles = tiles
+        self.gathering = False
+        self.edges = None
+        self.connections = []
+        self.processes = []
+        self.in_transit = []
+
+    def create_rooms(self):
+        if self.number_of_rooms != 1:
+            raise ValueError("only a single room can be split into tiles")
+        if self.exposure or self.hybrid:
+            raise ValueError("exposure and hybrid can not be split into tiles")
+        super().create_rooms()
+        self.start_tiles()
+
+    def start_tiles(self):
+        """starts a worker for every tile and hands it the persons of its tile"""
+        width = self.shape[0]
+        tiles = max(min(self.tiles or os.cpu_count() or 1, int(width)), 1)
+        self.edges = np.linspace(0, width, tiles + 1)
+        # whoever walks over the border of the room stays in the first or the last tile
+        self.edges[0], self.edges[-1] = -np.inf, np.inf
+        dtype = self.population.x.dtype
+        seeds = np.random.SeedSequence(int(self.rng.integers(2**63))).spawn(tiles)
+        for tile, seed in enumerate(seeds):
+            connection, worker_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target = tile_worker, daemon = True,
+                                              args = (worker_end, self.edges[tile], self.edges[tile + 1], self.shape, dtype, self.backend, seed))
+            process.start()
+            self.connections.append(connection)
+            self.processes.append(process)
+        self.scatter()
+
+    def schedule(self):
+        """a restored scenario (see checkpoint.restore) has no workers yet, they are started with the restored positions"""
+        if not self.connections:
+            self.start_tiles()
+
+    def owners(self, x):
+        """the tile of every position x"""
+        return np.searchsorted(self.edges[1:-1], x, side = "right")
+
+    def command(self, command, payloads):
+        """sends the command with its payload to every worker and returns their answers"""
+        for connection, payload in zip(self.connections, payloads):
+            connection.send((command, payload))
+        return [connection.recv() for connection in self.connections]
+
+    def update_scatters(self):
+        """every worker moves the persons of its tile, whoever left a tile is handed to the worker of their new tile"""
+        with self.profiler.phase("movement"):
+            border = self.rooms[0].border
+            leaving = self.command("frame", [(immigrants, self.speed, border) for immigrants in self.in_transit])
+        with self.profiler.phase("transfers"):
+            leaving = np.concatenate(leaving)
+            owners = self.owners(leaving["x"])
+            self.in_transit = [leaving[owners == tile] for tile in range(len(self.connections))]
+        if self.gathering:
+            self.gather()
+        self.profiler.steps(len(self.population))
+        self.frames += 1
+
+    def gather(self):
+        """brings the positions of the workers (and of the persons in transit) back into the population"""
+        persons = np.concatenate(self.command("positions", [None] * len(self.connections)) + self.in_transit)
+        population = self.population
+        population.x[persons["id"]], population.y[persons["id"]], population.angle[persons["id"]] = persons["x"], persons["y"], persons["angle"]
+
+    def scatter(self):
+        """hands the positions of the population to the workers (the opposite of gather), everybody to the worker of their tile"""
+        population = self.population
+        persons = tile_records(population.x.dtype, len(population))
+        persons["id"] = np.arange(len(population))
+        persons["x"], persons["y"], persons["angle"] = population.x, population.y, population.angle
+        owners = self.owners(persons["x"])
+        for tile, connection in enumerate(self.connections):
+            connection.send(("replace", persons[owners == tile]))
+        self.in_transit = [persons[:0] for connection in self.connections]
+
+    def update_variables(self, values):
+        """the positions are clamped to the (new) border in the population, so they are gathered before and scattered after"""
+        if self.connections:
+            self.gather()
+        super().update_variables(values)
+        if self.connections:
+            self.scatter()
+
+    def calculate_infected(self):
+        """the workers exchange their halos and find the contacts of their tiles, the coins and the infections are done here
+        (just like Room.calculate_infected does it for the whole room)"""
+        population = self.population
+        status = population.status
+        # the persons in transit are nowhere until the next frame, they are added to their tiles before anything else happens
+        for connection, immigrants in zip(self.connections, self.in_transit):
+            connection.send(("add", immigrants))
+        self.in_transit = [immigrants[:0] for immigrants in self.in_transit]
+        halo = np.concatenate(self.command("halo", [(status, self.radius)] * len(self.connections)))
+        ghosts = []
+        for tile in range(len(self.connections)):
+            low, high = self.edges[tile], self.edges[tile + 1]
+            near = (halo["x"] >= low - self.radius) & (halo["x"] < high + self.radius)
+            near &= (halo["x"] < low) | (halo["x"] >= high)
+            ghosts.append(halo[near])
+        contacts = self.command("infect", [(tile_ghosts, self.radius) for tile_ghosts in ghosts])
+        self.profiler.checks(sum(pairs[2] for pairs in contacts))
+        eligible = np.flatnonzero((status == V) | (status == I))
+        p = np.searchsorted(eligible, np.concatenate([pairs[0] for pairs in contacts]))
+        o = np.searchsorted(eligible, np.concatenate([pairs[1] for pairs in contacts]))
+        order = np.lexsort((o, p))
+        p, o = p[order], o[order]
+        coins = self.rng.random(len(p)) <= self.infectionrate
+        was_infected = status[eligible] == I
+        infected, got_infected = self.kernels.resolve_infections(was_infected, p, o, coins)
+        newly_infected = eligible[infected & ~was_infected]
+        status[newly_infected] = I
+        population.infected_days[newly_infected] = 0
+        self.list_of_infected.append(newly_infected)
+
+    def close(self):
+        """stops the worker processes"""
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.connections, self.processes = [], []
+        super().close()
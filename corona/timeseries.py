@@ -0,0 +1,131 @@
+"""the time series of a scenario: the number of infected, vulnerable, cured and deceased persons of every day.
+they are kept in numpy arrays which grow by doubling, together with the stacked curves of the graph on the left
+(i, v + i, c + v + i, d + c + v + i), which are updated with every new day instead of being summed up again.
+every new row can also be streamed into sinks (csv, jsonl or parquet files), so a long run can be watched while it is running."""
+import csv
+import json
+
+import numpy as np
+
+chars = ["i", "v", "c", "d"]
+
+
+class TimeSeries:
+    """data["i"] (and "v", "c", "d") is the curve of every day so far (a view into the arrays, so it can be used like the old lists),
+    stacked holds the stacked curves. sinks get every new row"""
+    def __init__(self, capacity = 256, sinks = ()):
+        self.counts = np.zeros((capacity, 4), dtype = np.int64)
+        self.stacked = np.zeros((capacity, 4), dtype = np.int64)
+        self.days = 0
+        self.sinks = list(sinks)
+
+    @classmethod
+    def from_counts(cls, counts):
+        """a time series which already holds the rows of counts (one row of i, v, c, d per day)"""
+        series = cls(capacity = max(256, len(counts)))
+        series.days = len(counts)
+        series.counts[:series.days] = counts
+        np.cumsum(series.counts[:series.days], axis = 1, out = series.stacked[:series.days])
+        return series
+
+    def __len__(self):
+        return self.days
+
+    def __getitem__(self, char):
+        return self.counts[:self.days, chars.index(char)]
+
+    def append(self, counts):
+        """adds the numbers of infected, vulnerable, cured and deceased persons of a new day"""
+        if self.days == len(self.counts):
+            self.counts = np.concatenate([self.counts, np.zeros_like(self.counts)])
+            self.stacked = np.concatenate([self.stacked, np.zeros_like(self.stacked)])
+        self.counts[self.days] = counts
+        np.cumsum(counts, out = self.stacked[self.days])
+        for sink in self.sinks:
+            sink.write(self.days, self.counts[self.days])
+        self.days += 1
+
+    def rows(self):
+        """every day so far, one row of i, v, c, d per day"""
+        return self.counts[:self.days]
+
+    def relative_graph(self):
+        """the x values and the stacked curves of the graph on the left, closed at the bottom so they can be filled"""
+        size = self.days
+        x = np.concatenate([[0], np.arange(size), [size - 1]])
+        out = {char: np.concatenate([[0], self.stacked[:size, n], [0]]) for n, char in enumerate(chars)}
+        return x, out
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+class CSVSink:
+    """writes one line per day into a csv file (day, i, v, c, d), every line is flushed right away"""
+    def __init__(self, path):
+        self.file = open(path, "w", newline = "")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["day"] + chars)
+        self.file.flush()
+
+    def write(self, day, counts):
+        self.writer.writerow([day] + [int(count) for count in counts])
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JSONLSink:
+    """writes one json object per day and line into a file, every line is flushed right away"""
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def write(self, day, counts):
+        row = {"day": day}
+        row.update({char: int(count) for char, count in zip(chars, counts)})
+        self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """writes the rows into a parquet file, batch_size days at a time (every batch is a row group). needs pyarrow"""
+    def __init__(self, path, batch_size = 1000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("writing parquet files needs pyarrow (pip install pyarrow), use a .csv or .jsonl file instead")
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([("day", pyarrow.int64())] + [(char, pyarrow.int64()) for char in chars])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.batch = []
+
+    def write(self, day, counts):
+        self.batch.append([day] + [int(count) for count in counts])
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            columns = list(zip(*self.batch))
+            self.writer.write_table(self.pyarrow.Table.from_arrays([self.pyarrow.array(column, self.pyarrow.int64()) for column in columns], schema = self.schema))
+            self.batch = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def open_sink(path):
+    """the sink for the file path, chosen by its ending (.csv, .jsonl or .parquet)"""
+    if path.endswith(".parquet"):
+        return ParquetSink(path)
+    if path.endswith(".jsonl") or path.endswith(".json"):
+        return JSONLSink(path)
+    return CSVSink(path)
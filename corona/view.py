@@ -0,0 +1,188 @@
+"""the window of the simulator. a FigureView is an observer of a scenario: the scenario tells it when its rooms have changed,
+everything else (placing the rooms on the figure, drawing the persons and the graph on the left) is done here."""
+import numpy as np
+from matplotlib.transforms import Bbox
+
+from .blitting import Blitter
+from .functions import find_opt_arangement
+from .rooms import colors
+
+
+def same_data(room, old):
+    """whether the persons of room are drawn just like the last time (old is (draw_data, draw_data2) of the last time)"""
+    return all(np.array_equal(a, b) for a, b in zip(old[0] + old[1], room.draw_data + room.draw_data2))
+
+
+class FigureView:
+    """puts the rooms of a scenario onto fig (right half) and the graph onto graph_ax (left half).
+    with blit the persons, the graph and the overlay are animated artists which are blitted (see blitting.py): a room is only
+    redrawn when its persons have changed, the graph when a day has passed, and the whole figure only after a resize
+    or when the rooms have been rearranged. without blit the artists are simply updated (for savefig, for example)"""
+    def __init__(self, fig, graph_ax, blit = True):
+        self.fig = fig
+        self.ax = graph_ax
+        self.current_arangement = [0,0]
+        self.overlay = None
+        self.rooms = []
+        self.blitter = Blitter(fig.canvas) if blit else None
+        if self.blitter:
+            self.blitter.add("graph", self.graph_region)
+            # the axes of the graph change with its curves, they are no part of its background
+            self.ax.xaxis.set_animated(True)
+            self.ax.yaxis.set_animated(True)
+
+    def find_opt_arangement(self, scenario):
+        """finds the optimal arangement for the rooms, that are beeing plotted"""
+        a, b = self.fig.get_size_inches()
+        return find_opt_arangement(scenario.number_of_rooms, ratio=(scenario.shape[1] * a / 2) / (scenario.shape[0] * b))
+
+    def place_rooms(self, scenario):
+        """puts every room of the scenario at its place on the figure"""
+        i, j = self.find_opt_arangement(scenario)
+        self.forget_rooms()
+        for l, room in enumerate(scenario.rooms):
+            if room.ax:
+                room.ax.remove()
+            room.show_on_fig(self.fig, i, 2 * j, (1 + (l // j)) * j + l + 1)
+            if room.title:
+                room.ax.set_title(room.title)
+            room.compute_scale(self.fig)
+            if self.blitter:
+                self.blitter.add(room, lambda room = room: room.ax.bbox)
+        self.rooms = list(scenario.rooms)
+        self.current_arangement = [i, j]
+
+    def forget_rooms(self):
+        """the rooms shown so far are no regions of the blitter any more"""
+        if self.blitter:
+            for room in self.rooms:
+                self.blitter.remove(room)
+        self.rooms = []
+
+    def force_redraw(self):
+        """the whole figure is drawn again before the next frame, because the layout has changed"""
+        if self.blitter:
+            self.blitter.invalidate()
+
+    def graph_region(self):
+        """the part of the figure the graph is drawn in, including its tick labels (the graph is on the left)"""
+        bbox = self.ax.bbox
+        pad = 12 * self.fig.dpi / 72
+        return Bbox.from_extents(0, max(bbox.y0 - 3 * pad, 0), bbox.x1 + pad, min(bbox.y1 + pad, self.fig.bbox.y1))
+
+    def overlay_region(self):
+        """the lower left quarter of the figure below the graph, where the report of the profiler is written (it grows with the phases)"""
+        return Bbox.from_extents(0, 0, self.fig.bbox.x1 / 2, self.graph_region().y0)
+
+    def refresh(self):
+        """draws the whole figure if the blitter needs it, returns whether every region has to be drawn again"""
+        if not self.blitter or not self.blitter.draw():
+            return False
+        self.blit_graph()
+        if self.overlay:
+            self.blitter.update("overlay", [self.overlay])
+        return True
+
+    def blit_graph(self):
+        """makes the graph (its curves and axes) animated and blits it"""
+        artists = list(self.ax.patches) + list(self.ax.collections) + list(self.ax.lines) + [self.ax.xaxis, self.ax.yaxis]
+        artists.sort(key = lambda artist: artist.get_zorder())
+        # a draw of the whole figure would adjust the limits to the new curves, drawing the artists alone doesn't
+        self.ax.autoscale_view()
+        for artist in artists:
+            artist.set_animated(self.blitter is not None)
+        if self.blitter:
+            self.blitter.update("graph", artists)
+
+    def attach(self, scenario):
+        """starts observing the scenario and shows its rooms"""
+        scenario.observers.append(self)
+        self.place_rooms(scenario)
+        self.draw_rooms(scenario)
+
+    def rooms_changed(self, scenario):
+        self.place_rooms(scenario)
+        self.force_redraw()
+
+    def destroyed(self, scenario):
+        for room in scenario.rooms:
+            room.ax.remove()
+            room.ax = None
+        scenario.observers.remove(self)
+        self.forget_rooms()
+
+    def update_room_axes(self, scenario):
+        """determines weather current arangement of rooms is still optimal"""
+        with scenario.profiler.phase("layout"):
+            i, j = self.find_opt_arangement(scenario)
+            if i != self.current_arangement[0] or j != self.current_arangement[1]:
+                self.place_rooms(scenario)
+                self.force_redraw()
+
+    def draw_rooms(self, scenario):
+        """plots the persons of every room whose persons have changed, returns the changed artists"""
+        list_of_scatters = []
+        profiler = scenario.profiler
+        with profiler.phase("draw"):
+            fresh = self.refresh()
+        for room in scenario.rooms:
+            old = room.draw_data, room.draw_data2
+            room.clear_room()
+            with profiler.phase("layout"):
+                room.compute_scale(self.fig)
+            with profiler.phase("register"):
+                room.register(scenario.population, scenario.radius)
+                if room.scatter and not fresh and same_data(room, old):
+                    continue
+            with profiler.phase("draw"):
+                scatters = room.draw()
+                for scat in scatters:
+                    scat.set_animated(self.blitter is not None)
+                    list_of_scatters.append(scat)
+                if self.blitter:
+                    self.blitter.update(room, scatters)
+        return list_of_scatters
+
+    def draw_graph(self, scenario):
+        """draws the graph on the left, which shows the number of infected, cured vulnerable and deceased persons"""
+        with scenario.profiler.phase("draw"):
+            x, data = scenario.update_relative_graph()
+            self.ax.clear()
+            for char in ["d", "c", "v", "i"]:
+                self.ax.fill(x, data[char], c = colors[char])
+            self.ax.plot(x, [scenario.healthcare_max for i in x], c = "0.5")
+            self.blit_graph()
+
+    def draw_profile(self, profiler):
+        """writes the report of the profiler (see profiling.py) into the lower left corner of the figure, returns the text.
+        without a profiler the text is removed again"""
+        if profiler is None:
+            if self.overlay:
+                self.overlay.remove()
+                self.overlay = None
+                if self.blitter:
+                    self.blitter.remove("overlay")
+            return None
+        if not self.overlay:
+            self.overlay = self.fig.text(0.01, 0.01, profiler.report(), family = "monospace", fontsize = 6, va = "bottom",
+                                         bbox = {"facecolor": "white", "alpha": 0.8}, animated = self.blitter is not None)
+            if self.blitter:
+                self.blitter.add("overlay", self.overlay_region)
+        self.overlay.set_text(profiler.report())
+        if self.blitter and not self.refresh():
+            self.blitter.update("overlay", [self.overlay])
+        return self.overlay
+
+    def draw_bands(self, ensemble, healthcare_max):
+        """draws the mean and the quantile bands of an ensemble (see ensemble.py) on the left instead of the graph of the running scenario"""
+        bands = ensemble.bands()
+        quantiles = ensemble.quantiles
+        mean = ensemble.mean()
+        x = np.arange(ensemble.curves.shape[2])
+        self.ax.clear()
+        for char in ["d", "c", "v", "i"]:
+            for k in range(len(quantiles) // 2):
+                self.ax.fill_between(x, bands[quantiles[k]][char], bands[quantiles[-1 - k]][char], color = colors[char], alpha = 0.2)
+            self.ax.plot(x, mean[char], c = colors[char])
+        self.ax.plot(x, [healthcare_max for i in x], c = "0.5")
+        self.blit_graph()
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from corona.backends import get_backend
+from corona.profiling import Profiler
+from corona.simulation import Simulation
+
+pytest.importorskip("numba")
+
+
+def run(config, days):
+    simulation = Simulation(config)
+    simulation.scenario.profiler = profiler = Profiler()
+    simulation.run(days)
+    checks = profiler.contact_checks()
+    population = simulation.scenario.population
+    state = {name: getattr(population, name).copy() for name in ["x", "y", "angle", "status", "room"]}
+    state["data"] = simulation.scenario.data.rows().copy()
+    simulation.close()
+    return state, checks
+
+
+@pytest.mark.parametrize("scenario", ["Standard", "Supermarket", "Cluster", "Quarantine"])
+def test_backends_are_identical(scenario):
+    config = {"scenario": scenario, "members": 80, "number of rooms": 2, "shape": 30, "number of infected": 5, "seed": 4}
+    numpy_state, numpy_checks = run(dict(config, backend = "numpy"), 5)
+    numba_state, numba_checks = run(dict(config, backend = "numba"), 5)
+    for name in numpy_state:
+        assert np.array_equal(numpy_state[name], numba_state[name]), name
+    assert numba_checks == numpy_checks > 0
+
+
+def test_compact_positions_differ_by_rounding():
+    # the exception of backends.py: compact positions drift apart by float32 rounding only
+    config = {"scenario": "Standard", "members": 200, "shape": 40, "compact": True, "seed": 4, "infection rate": 0}
+    numpy_state, numpy_checks = run(dict(config, backend = "numpy"), 1)
+    numba_state, numba_checks = run(dict(config, backend = "numba"), 1)
+    assert np.abs(numpy_state["x"] - numba_state["x"]).max() < 1e-3
+    assert np.abs(numpy_state["y"] - numba_state["y"]).max() < 1e-3
+    assert np.array_equal(numpy_state["status"], numba_state["status"])
+
+
+@pytest.mark.parametrize("radius", [0.5, 1.5, 2, 3.7])
+def test_kernels_are_identical(radius):
+    numpy_backend, numba_backend = get_backend("numpy"), get_backend("numba")
+    rng = np.random.default_rng(int(radius * 10))
+    size = (25, 18)
+    x = rng.random(400) * (size[0] + 4) - 2
+    y = rng.random(400) * (size[1] + 4) - 2
+    numpy_pairs = numpy_backend.contact_pairs(x, y, size, radius)
+    numba_pairs = numba_backend.contact_pairs(x, y, size, radius)
+    for numpy_result, numba_result in zip(numpy_pairs, numba_pairs):
+        assert np.array_equal(numpy_result, numba_result)
+    p, o, checks = numpy_pairs
+    infected = rng.random(400) < 0.1
+    coins = rng.random(len(p)) < 0.5
+    for numpy_result, numba_result in zip(numpy_backend.resolve_infections(infected, p, o, coins),
+                                          numba_backend.resolve_infections(infected, p, o, coins)):
+        assert np.array_equal(numpy_result, numba_result)
+    angle, angle_diff = rng.random(400), rng.normal(0, 0.1, 400)
+    walked = []
+    for backend in [numpy_backend, numba_backend]:
+        arrays = [x.copy(), y.copy(), angle.copy(), angle_diff.copy()]
+        backend.walk(*arrays, np.full(400, 25.0), np.full(400, 18.0), np.full(400, 3.0), 0.5)
+        walked.append(arrays)
+    for numpy_array, numba_array in zip(*walked):
+        assert np.array_equal(numpy_array, numba_array)
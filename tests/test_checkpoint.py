@@ -0,0 +1,28 @@
+import os
+
+import numpy as np
+
+from corona import checkpoint
+from corona.simulation import Simulation
+
+
+def test_forks_have_storage_of_their_own(tmp_path):
+    storage = str(tmp_path / "population")
+    simulation = Simulation({"scenario": "Standard", "members": 100, "shape": 30, "storage": storage, "seed": 1})
+    simulation.day()
+    path = tmp_path / "day.npz"
+    checkpoint.save(simulation.scenario, path)
+    source = simulation.scenario.population.x.copy()
+    forks = checkpoint.fork(path, 2, seed = 2)
+    files = [fork.scenario.population.files["x"] for fork in forks]
+    assert len(set(files + [simulation.scenario.population.files["x"]])) == 3
+    assert all(os.path.dirname(name) != storage for name in files)
+    for fork in forks:
+        fork.day()
+    simulation.day()
+    assert not np.array_equal(forks[0].scenario.population.x, forks[1].scenario.population.x)
+    assert not np.array_equal(simulation.scenario.population.x, source)
+    assert np.array_equal(checkpoint.read(path)["population x"], source)
+    for fork in forks:
+        fork.close()
+    simulation.close()
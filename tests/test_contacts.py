@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from corona import contacts
+from corona.population import C, I, V, Population
+from corona.rooms import Room
+from corona.simulation import Simulation
+
+
+
+def test_neighbour_lists_only_with_exposure():
+    simulation = Simulation({"scenario": "Standard", "members": 100, "shape": 30, "neighbour skin": 2, "seed": 1})
+    assert all(room.neighbours is None for room in simulation.scenario.rooms)
+
+
+def test_neighbour_list_outlives_a_day():
+    days = 20
+    simulation = Simulation({"scenario": "Standard", "members": 200, "shape": 40, "speed": 0.1, "exposure": True,
+                             "neighbour skin": 4, "seed": 1})
+    for day in range(days):
+        simulation.day()
+    neighbours = simulation.scenario.rooms[0].neighbours
+    assert 0 < neighbours.rebuilds < days
+
+
+def reference_loop(x, y, infected, size, radius, rate, rng):
+    """the loop of the old Room.calculate_infected (one Person after another, each looking at the raster cells around them):
+    the pairs in the order in which they were checked, their coins, who is infected at the end and who got infected themselves"""
+    width, height = int(size[0]), int(size[1])
+    raster = [[[] for j in range(height)] for i in range(width)]
+    for n in range(len(x)):
+        if 0 <= int(x[n]) < width and 0 <= int(y[n]) < height:
+            raster[int(x[n])][int(y[n])].append(n)
+    rad_int = int(radius)
+    pairs = []
+    for p in range(len(x)):
+        for i in range(max(int(x[p]) - rad_int, 0), min(int(x[p]) + rad_int + 1, width - 1)):
+            for j in range(max(int(y[p]) - rad_int, 0), min(int(y[p]) + rad_int + 1, height - 1)):
+                for o in raster[i][j]:
+                    if o < p and (x[p] - x[o])**2 + (y[p] - y[o])**2 <= radius**2:
+                        pairs.append((p, o))
+    coins = rng.random(len(pairs)) <= rate
+    status = infected.copy()
+    got_infected = np.zeros(len(x), dtype = bool)
+    for p in range(len(x)):
+        for (q, o), coin in zip(pairs, coins):
+            if q == p and coin:
+                if infected[p]:
+                    status[o] = True
+                elif status[o]:
+                    got_infected[p] = True
+        status[p] |= got_infected[p]
+    return pairs, coins, status, got_infected
+
+
+def random_room(rng, number, size):
+    x = rng.random(number) * (size[0] + 4) - 2
+    y = rng.random(number) * (size[1] + 4) - 2
+    return x, y, rng.random(number) < 0.2
+
+
+@pytest.mark.parametrize("radius", [0.5, 1, 1.5, 2, 3.7])
+@pytest.mark.parametrize("seed", range(4))
+def test_kernel_is_the_old_loop(radius, seed):
+    rng = np.random.default_rng(seed)
+    size = (12 + seed, 9)
+    x, y, infected = random_room(rng, 150, size)
+    pairs, coins, status, got_infected = reference_loop(x, y, infected, size, radius, 0.4, np.random.default_rng(seed))
+    p, o, checks = contacts.contact_pairs(x, y, size, radius)
+    assert list(zip(p.tolist(), o.tolist())) == pairs
+    assert checks >= len(pairs)
+    infected_now, got_infected_now = contacts.resolve_infections(infected, p, o, coins)
+    assert np.array_equal(infected_now, status)
+    assert np.array_equal(got_infected_now, got_infected)
+
+
+def test_room_infects_like_the_old_loop():
+    # the contacts are searched among the vulnerable and infected persons only, in the order of their index
+    rng = np.random.default_rng(7)
+    population = Population(rng)
+    room = Room(number_infected = 0, act_size = (20, 15))
+    room.id = 0
+    room.add_persons(population, population.add(room, 200))
+    population.status[rng.choice(200, 30, replace = False)] = I
+    population.status[rng.choice(200, 20, replace = False)] = C
+    status = population.status.copy()
+    eligible = np.flatnonzero((status == V) | (status == I))
+    x, y = population.x[eligible], population.y[eligible]
+    pairs, coins, expected, got_infected = reference_loop(x, y, status[eligible] == I, room.actual_size, 2, 0.3,
+                                                          np.random.default_rng(3))
+    assert expected.sum() > np.count_nonzero(status == I)
+    room.calculate_infected(population, [], 2, 0.3, np.random.default_rng(3))
+    assert np.array_equal(population.status[eligible] == I, expected)
+    assert np.array_equal(population.status[status == C], status[status == C])
@@ -0,0 +1,13 @@
+import multiprocessing
+import tempfile
+
+from corona.ensemble import run_ensemble
+
+
+def test_replicates_leave_nothing_behind(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    for config in [{"storage": True}, {"tiles": 2}]:
+        ensemble = run_ensemble(dict(config, members = 20, shape = 10), 3, 2, seed = 1, processes = 0)
+        assert ensemble.curves.shape == (2, 4, 3)
+    assert list(tmp_path.iterdir()) == []
+    assert multiprocessing.active_children() == []
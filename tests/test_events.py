@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from corona import simulation as simulation_module
+from corona.events import EventQueue
+from corona.population import C, D, I
+from corona.scenarios import Cluster, Quarantine, Supermarket, scenario
+from corona.simulation import Simulation
+
+
+def test_queue_is_a_full_scan():
+    # the persons due on a frame are the ones a scan of everybody's next frame finds, in the order of their index
+    rng = np.random.default_rng(1)
+    number = 500
+    next_frame = rng.integers(0, 20, number)
+    queue = EventQueue(next_frame, np.arange(number))
+    for frame in range(200):
+        due = queue.pop(frame)
+        assert np.array_equal(due, np.flatnonzero(next_frame == frame))
+        next_frame[due] = frame + rng.integers(1, 15, len(due))
+        queue.push(next_frame[due], due)
+
+
+class ScanCluster(Cluster):
+    """the jumps the way they used to be found: the time since the last jump of everybody, on every frame"""
+    def create_rooms(self):
+        super().create_rooms()
+        self.time_since_jump = self.frames + self.jumptime - 1 - self.population.next_jump
+
+    def due_jumpers(self):
+        jumpy = self.population.jumpy
+        self.time_since_jump[jumpy] += 1
+        list_of_jumpers = np.flatnonzero(jumpy & (self.time_since_jump >= self.jumptime))
+        self.time_since_jump[list_of_jumpers] = 0
+        return list_of_jumpers
+
+
+class ScanSupermarket(Supermarket):
+    """the ways to the market and home again the way they used to be found, by counting up the time of everybody"""
+    def create_rooms(self):
+        super().create_rooms()
+        self.time_since_purchase = self.frames + self.population.purchase_interval - 1 - self.population.next_trip
+        self.time_in_market = np.zeros(len(self.population), dtype = int)
+
+    def update_scatters(self):
+        population = self.population
+        in_market = population.room == self.market.id
+        self.time_in_market[in_market] += 1
+        list_of_leavers = np.flatnonzero(in_market & (self.time_in_market >= self.shopping_time))
+        self.time_in_market[list_of_leavers] = 0
+        population.purchase_interval[list_of_leavers] = 50 + (self.rng.random(len(list_of_leavers)) * 20 - 2).astype(int)
+        self.time_since_purchase[~in_market] += 1
+        list_of_thrifters = np.flatnonzero(~in_market & (self.time_since_purchase >= population.purchase_interval))
+        self.time_since_purchase[list_of_thrifters] = 0
+        self.transfer_home(list_of_leavers)
+        population.home_x[list_of_thrifters] = population.x[list_of_thrifters]
+        population.home_y[list_of_thrifters] = population.y[list_of_thrifters]
+        self.transfer(list_of_thrifters, self.market)
+        return scenario.update_scatters(self)
+
+
+class ScanQuarantine(Quarantine):
+    """whoever goes into quarantine or home again found by looking at everybody on every frame"""
+    def update_scatters(self):
+        population = self.population
+        in_quarantine = population.room == self.quarantine_room.id
+        self.transfer(np.flatnonzero((population.status == I) & population.symptomatic & ~in_quarantine), self.quarantine_room)
+        self.transfer_home(np.flatnonzero(in_quarantine & ((population.status == C) | (population.status == D))))
+        return scenario.update_scatters(self)
+
+
+def run(config, days, changes):
+    simulation = Simulation(config)
+    for day in range(days):
+        if day in changes:
+            simulation.scenario.change_values(changes[day])
+        simulation.day()
+    population = simulation.scenario.population
+    state = {name: getattr(population, name).copy() for name in ["x", "y", "status", "room"]}
+    state["data"] = simulation.scenario.data.rows().copy()
+    simulation.close()
+    return state
+
+
+@pytest.mark.parametrize("name, scan, extra, changes", [
+    ("Cluster", ScanCluster, {"percentage of jumpers": 0.3, "time between jumps": 3}, {4: {"time between jumps": 8}, 8: {"time between jumps": 2}}),
+    ("Supermarket", ScanSupermarket, {"time between purchases": 4}, {5: {"time between purchases": 9}}),
+    ("Quarantine", ScanQuarantine, {"chance for symptoms": 0.8}, {}),
+])
+def test_events_are_the_old_full_scans(monkeypatch, name, scan, extra, changes):
+    config = dict({"scenario": name, "members": 60, "number of rooms": 3, "shape": 20, "number of infected": 5,
+                   "infection rate": 0.5, "seed": 2}, **extra)
+    events = run(config, 12, changes)
+    monkeypatch.setitem(simulation_module.scenario_dict, name, scan)
+    scans = run(config, 12, changes)
+    for key in events:
+        assert np.array_equal(events[key], scans[key]), key
+    assert events["data"][-1][2] > 0
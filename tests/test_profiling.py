@@ -0,0 +1,31 @@
+from corona.profiling import Profiler
+from corona.simulation import Simulation
+
+config = {"scenario": "Standard", "members": 200, "shape": 40, "number of infected": 5, "seed": 1}
+
+
+def profiled(config):
+    simulation = Simulation(config)
+    simulation.scenario.profiler = Profiler()
+    return simulation
+
+
+def test_checks_are_counted_per_scenario():
+    alone = profiled(config)
+    alone.run(3)
+    first, second = profiled(config), profiled(dict(config, members = 400))
+    for day in range(3):
+        first.day()
+        second.day()
+    assert first.scenario.profiler.contact_checks() == alone.scenario.profiler.contact_checks() > 0
+    assert second.scenario.profiler.contact_checks() > first.scenario.profiler.contact_checks()
+    for simulation in [alone, first, second]:
+        simulation.close()
+
+
+def test_checks_of_exposure_and_tiles():
+    for extra in [{"exposure": True}, {"tiles": 2}]:
+        simulation = profiled(dict(config, **extra))
+        simulation.run(2)
+        assert simulation.scenario.profiler.contact_checks() > 0
+        simulation.close()
@@ -0,0 +1,33 @@
+import numpy as np
+
+from corona.recording import Recording
+from corona.simulation import Simulation
+
+config = {"scenario": "Standard", "members": 100, "shape": 30, "number of infected": 5, "seed": 1}
+
+
+def record(path, days):
+    simulation = Simulation(dict(config, record = str(path)))
+    for day in range(days):
+        simulation.day()
+    simulation.close()
+    return Recording.load(str(path))
+
+
+def test_trajectory_has_the_data_of_the_npz(tmp_path):
+    saved = record(tmp_path / "run.npz", 4)
+    trajectory = record(tmp_path / "run.traj", 4)
+    assert len(saved.data) == 4
+    assert np.array_equal(saved.data, trajectory.data)
+    assert np.array_equal(saved.day, trajectory.day)
+    assert np.array_equal(saved.x, trajectory.x)
+
+
+def test_unfinished_trajectory(tmp_path):
+    simulation = Simulation(dict(config, record = str(tmp_path / "run.traj")))
+    for day in range(3):
+        simulation.day()
+    recording = simulation.recorder.recording()
+    assert len(recording.data) == 2
+    assert np.array_equal(recording.data, simulation.scenario.data.rows()[:2])
+    simulation.close()
@@ -0,0 +1,74 @@
+import numpy as np
+
+from corona.population import Population
+from corona.rooms import Room
+from corona.simulation import Simulation
+
+
+def check(room, population, expected):
+    persons = room.persons
+    assert room.members == len(expected) == len(persons)
+    assert set(persons.tolist()) == expected
+    # every person knows their place in the room
+    assert np.array_equal(population.slot[persons], np.arange(room.members))
+
+
+def test_swap_remove_keeps_the_room_consistent():
+    rng = np.random.default_rng(5)
+    population = Population(rng)
+    room = Room(number_infected = 0, act_size = (20, 20))
+    room.id = 0
+    everybody = population.add(room, 300)
+    inside = set()
+    outside = list(everybody)
+    for step in range(300):
+        if inside and rng.random() < 0.5:
+            leaving = rng.choice(sorted(inside), rng.integers(1, min(len(inside), 30) + 1), replace = False)
+            before = room.persons.copy()
+            slots = population.slot[leaving]
+            end = room.members - len(leaving)
+            room.remove_persons(population, leaving)
+            inside -= set(leaving.tolist())
+            # whoever stays before the new end keeps their place, only the last ones move into the places that became free
+            # (in their order, the places in the order of the persons who left)
+            kept = ~np.isin(before[:end], leaving)
+            assert np.array_equal(room.persons[:end][kept], before[:end][kept])
+            tail = before[end:][~np.isin(before[end:], leaving)]
+            assert np.array_equal(room.persons[slots[slots < end]], tail)
+        elif outside:
+            arriving = [outside.pop(rng.integers(len(outside))) for n in range(min(rng.integers(1, 30), len(outside)))]
+            room.add_persons(population, np.array(arriving))
+            inside |= set(arriving)
+        else:
+            continue
+        outside = sorted(set(everybody.tolist()) - inside)
+        check(room, population, inside)
+
+
+def test_remove_everybody_and_the_last_one():
+    population = Population(np.random.default_rng(1))
+    room = Room(number_infected = 0, act_size = (20, 20))
+    room.id = 0
+    persons = population.add(room, 10)
+    room.add_persons(population, persons)
+    room.remove_persons(population, persons[-1:])
+    check(room, population, set(persons[:-1].tolist()))
+    room.remove_persons(population, persons[:-1][::-1])
+    check(room, population, set())
+    room.add_persons(population, persons[3:5])
+    check(room, population, {int(persons[3]), int(persons[4])})
+
+
+def test_bulk_transfers_keep_every_room_consistent():
+    for name in ["Cluster", "Supermarket", "Quarantine"]:
+        simulation = Simulation({"scenario": name, "members": 50, "number of rooms": 3, "shape": 20, "number of infected": 5,
+                                 "infection rate": 0.5, "percentage of jumpers": 0.5, "time between jumps": 2, "seed": 3})
+        simulation.run(6)
+        scenario = simulation.scenario
+        population = scenario.population
+        seen = np.concatenate([room.persons for room in scenario.rooms])
+        assert np.array_equal(np.sort(seen), np.arange(len(population)))
+        for room in scenario.rooms:
+            assert np.array_equal(population.slot[room.persons], np.arange(room.members))
+            assert (population.room[room.persons] == room.id).all()
+        simulation.close()
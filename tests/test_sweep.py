@@ -0,0 +1,26 @@
+import multiprocessing
+import tempfile
+
+from corona.sweep import latin_hypercube, run_one, sweep, value_range
+
+
+def test_shape_starts_at_smallest():
+    assert value_range("shape")[0] == 5
+    assert value_range("shape", 3)[0] == 5
+    assert min(config["shape"] for config in latin_hypercube(["shape"], 20, seed = 1)) >= 5
+
+
+def test_failed_run_is_a_row():
+    rows = sweep([{"shape": 1}, {"shape": 10}], 2, base = {"members": 20}, processes = 1, seed = 1)
+    assert rows[0]["error"] == "ValueError: Everything is border"
+    assert "error" not in rows[1] and rows[1]["peak infected"] >= 1
+
+
+def test_runs_leave_nothing_behind(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    rows = [run_one(({"members": 20, "shape": 10, "storage": True}, 2, 1)),
+            run_one(({"members": 20, "shape": 1, "storage": True}, 2, 1)),
+            run_one(({"members": 20, "shape": 10, "tiles": 2}, 2, 1))]
+    assert ["error" in row for row in rows] == [False, True, False]
+    assert list(tmp_path.iterdir()) == []
+    assert multiprocessing.active_children() == []
@@ -0,0 +1,45 @@
+import numpy as np
+
+from corona import checkpoint
+from corona.simulation import Simulation
+from corona.tiling import TiledScenario
+
+config = {"scenario": "Standard", "members": 300, "shape": 40, "radius": 1.5, "infection rate": 0.1, "number of infected": 5,
+          "tiles": 2}
+
+
+def test_checkpoint_of_tiled_run(tmp_path):
+    simulation = Simulation(dict(config, seed = 1))
+    start = simulation.scenario.population.x.copy()
+    for day in range(3):
+        simulation.day()
+    path = tmp_path / "tiled.npz"
+    checkpoint.save(simulation.scenario, path)
+    # the positions were gathered from the workers, not the ones of day 0
+    positions = simulation.scenario.population.x.copy()
+    assert not np.array_equal(positions, start)
+    days = len(simulation.scenario.data)
+    simulation.close()
+
+    restored = checkpoint.load(path, seed = 2)
+    assert isinstance(restored, TiledScenario)
+    assert np.array_equal(restored.population.x, positions)
+    continued = Simulation(scenario = restored)
+    for day in range(2):
+        continued.day()
+    assert len(restored.data) == days + 2
+    restored.gather()
+    assert not np.array_equal(restored.population.x, positions)
+    continued.close()
+
+
+def test_clamping_reaches_workers():
+    simulation = Simulation(dict(config, seed = 3))
+    simulation.day()
+    scenario = simulation.scenario
+    scenario.change_values({"speed": 3})
+    scenario.gather()
+    width, height, border = scenario.room_geometry()
+    assert (scenario.population.x >= border).all() and (scenario.population.x <= width - border).all()
+    simulation.day()
+    simulation.close()